@@ -0,0 +1,8 @@
+# Same as `efficientnet_b4_ros75_aug_pretrained_focal.py`, but trained with
+# mixed precision, and the batches and the weights in channels-last memory
+# format, which the Tensor Core convolutions of cuDNN prefer under fp16.
+_base_ = './efficientnet_b4_ros75_aug_pretrained_focal.py'
+
+data_preprocessor = dict(to_channels_last=True)
+
+optim_wrapper = dict(type='AmpOptimWrapper', loss_scale='dynamic')
@@ -5,48 +5,86 @@ data_preprocessor = dict(
     mean=[151.14, 102.69, 97.74],
     std=[70.03, 55.91, 54.73],
     to_rgb=True,
+    # copy the pinned batches to GPU asynchronously
+    non_blocking=True,
 )
 
+# dataloader workers per process, set `NUM_WORKERS` to tune it for the host.
+# Every worker is pinned to its own physical core, so don't use more workers
+# than the physical cores minus one (reserved for the main process).
+num_workers = {{'$NUM_WORKERS:5'}}
+# batches loaded in advance by each worker, lower it if the shared memory is
+# limited. Values above 4 don't help. It and `persistent_workers` are only
+# valid with workers, so both are left out for `NUM_WORKERS=0` (loading in the
+# main process, e.g. for debugging). PyTorch < 2.0 rejects any
+# `prefetch_factor` without workers, even None, so the key is not passed.
+prefetch_factor = 4
+persistent_workers = num_workers > 0
+worker_options = dict(
+    prefetch_factor=prefetch_factor) if num_workers > 0 else dict()
+# The val workers are pinned to the same cores as the train workers, which
+# are idle during validation.
+worker_init_fn = dict(type='mmpretrain.affinity_worker_init_fn')
+
 train_pipeline = [
-    dict(type='LoadImageFromFile'),     # read image
-    dict(type='Resize', scale=(640, 640), interpolation='bicubic'),
+    # read image with libjpeg-turbo if `PyTurboJPEG` is installed
+    dict(type='LoadJPEGFromFile', fast_dct=True),
+    # no antialiasing, like the cv2 bicubic resize used before
+    dict(type='TensorResize', scale=(640, 640), interpolation='bicubic',
+         antialias=False),
     dict(type='PackInputs'),         # prepare images and labels
 ]
 
 test_pipeline = [
-    dict(type='LoadImageFromFile'),     # read image
-    dict(type='Resize', scale=(640, 640), interpolation='bicubic'),
+    # read image with libjpeg-turbo if `PyTurboJPEG` is installed
+    dict(type='LoadJPEGFromFile', fast_dct=True),
+    # no antialiasing, like the cv2 bicubic resize used before
+    dict(type='TensorResize', scale=(640, 640), interpolation='bicubic',
+         antialias=False),
     dict(type='PackInputs'),                 # prepare images and labels
 ]
 
 train_dataloader = dict(
     batch_size=8,
-    num_workers=5,
+    num_workers=num_workers,
+    worker_init_fn=worker_init_fn,
     dataset=dict(
         type=dataset_type,
-        data_root='../../B_E_P_N_aug',
+        # set `BEPN_AUG_ROOT` to read a copy staged in /dev/shm, see
+        # `tools_created/stage_to_shm.sh`
+        data_root='{{$BEPN_AUG_ROOT:../../B_E_P_N_aug}}',
         ann_file='meta/train.txt',
         data_prefix='train',
         with_label=True,
         classes=['normal', 'polyps', 'barretts', 'esophagitis'],
         pipeline=train_pipeline),
         sampler=dict(type='CoSenROSSampler', ros_pct = 0.75, rus_maj_pct = 0.8, shuffle=True),
-    persistent_workers=True,
+    persistent_workers=persistent_workers,
+    pin_memory=True,
+    **worker_options,
+    # With PyTorch >= 2.6, uncomment to yield every batch as soon as any
+    # worker finishes it, so a worker stuck on slow images doesn't block the
+    # others. The sampler still decides the content of every batch, only the
+    # order of the batches within an epoch is no longer reproducible.
+    # in_order=False,
 )
 
 val_dataloader = dict(
     batch_size=8,
-    num_workers=5,
+    num_workers=num_workers,
+    worker_init_fn=worker_init_fn,
     dataset=dict(
         type=dataset_type,
-        data_root='../../B_E_P_N',
+        data_root='{{$BEPN_ROOT:../../B_E_P_N}}',
         ann_file='meta/test.txt',
         data_prefix='test',
         with_label=True,
         classes=['normal', 'polyps', 'barretts', 'esophagitis'],
         pipeline=test_pipeline),
     sampler=dict(type='DefaultSampler', shuffle=False),
-    persistent_workers=True,
+    persistent_workers=persistent_workers,
+    pin_memory=True,
+    **worker_options,
 )
 val_evaluator = [
         dict(type='Accuracy', topk=(1)),
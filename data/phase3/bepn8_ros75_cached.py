@@ -0,0 +1,33 @@
+# Same as `bepn8_ros75.py`, but the images are loaded from caches of the
+# resized images, which are built once by:
+#
+#   python tools/misc/cache_dataset.py data/phase3/bepn8_ros75.py \
+#       ${BEPN_AUG_ROOT:-../../B_E_P_N_aug}/cache/train_640.npy --phase train
+#   python tools/misc/cache_dataset.py data/phase3/bepn8_ros75.py \
+#       ${BEPN_ROOT:-../../B_E_P_N}/cache/test_640.npy --phase val
+#
+# The caches are read from the `cache` folder of the same data roots as
+# `bepn8_ros75.py`, so set the same `BEPN_AUG_ROOT` and `BEPN_ROOT` when
+# building and when reading them. Only valid as long as the pipelines don't
+# have random augmentations, and the caches must be rebuilt if the annotation
+# files change.
+_base_ = './bepn8_ros75.py'
+
+train_cache_root = '{{$BEPN_AUG_ROOT:../../B_E_P_N_aug}}/cache'
+test_cache_root = '{{$BEPN_ROOT:../../B_E_P_N}}/cache'
+
+train_pipeline = [
+    dict(type='LoadImageFromCache',
+         cache_file=train_cache_root + '/train_640.npy'),
+    dict(type='PackInputs'),         # prepare images and labels
+]
+
+test_pipeline = [
+    dict(type='LoadImageFromCache',
+         cache_file=test_cache_root + '/test_640.npy'),
+    dict(type='PackInputs'),                 # prepare images and labels
+]
+
+train_dataloader = dict(dataset=dict(pipeline=train_pipeline))
+val_dataloader = dict(dataset=dict(pipeline=test_pipeline))
+test_dataloader = dict(dataset=dict(pipeline=test_pipeline))
@@ -0,0 +1,25 @@
+# Same as `bepn8_ros75.py`, but the workers only read the JPEG bytes, and the
+# decoding (nvJPEG) and the bicubic resizing are done on GPU by the data
+# preprocessor.
+_base_ = './bepn8_ros75.py'
+
+data_preprocessor = dict(
+    # the decoded images are already in 'RGB' order
+    decode_jpeg=True,
+    resize_scale=(640, 640),
+    resize_interpolation='bicubic',
+)
+
+train_pipeline = [
+    dict(type='LoadImageBytesFromFile'),    # read the encoded image
+    dict(type='PackInputs'),         # prepare images and labels
+]
+
+test_pipeline = [
+    dict(type='LoadImageBytesFromFile'),    # read the encoded image
+    dict(type='PackInputs'),                 # prepare images and labels
+]
+
+train_dataloader = dict(dataset=dict(pipeline=train_pipeline))
+val_dataloader = dict(dataset=dict(pipeline=test_pipeline))
+test_dataloader = dict(dataset=dict(pipeline=test_pipeline))
@@ -1,6 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from mmcv.transforms import (CenterCrop, LoadImageFromFile, Normalize,
-                             RandomFlip, RandomGrayscale, RandomResize, Resize)
+                             RandomFlip, RandomResize, Resize)
 
 from mmpretrain.registry import TRANSFORMS
 from .auto_augment import (AutoAugment, AutoContrast, BaseAugTransform,
@@ -10,19 +10,23 @@ from .auto_augment import (AutoAugment, AutoContrast, BaseAugTransform,
                            SolarizeAdd, Translate)
 from .formatting import (Collect, NumpyToPIL, PackInputs, PackMultiTaskInputs,
                          PILToNumpy, Transpose, PackSelfSupInputs)
+from .loading import (LoadImageBytesFromFile, LoadImageFromCache,
+                      LoadJPEGFromFile)
 from .processing import (Albumentations, BEiTMaskGenerator, CleanCaption,
                          ColorJitter, EfficientNetCenterCrop,
                          EfficientNetRandomCrop, Lighting,
                          MAERandomResizedCrop, RandomCrop, RandomErasing,
+                         RandomGrayscale,
                          RandomResizedCrop,
                          RandomPatchWithLabels,
                          RandomResizedCropAndInterpolationWithTwoPic,
-                         RandomTranslatePad, ResizeEdge, SimMIMMaskGenerator)
+                         RandomTranslatePad, ResizeEdge, SimMIMMaskGenerator,
+                         TensorResize)
 from .utils import get_transform_idx, remove_transform
 from .wrappers import ApplyToList, MultiView
 
-for t in (CenterCrop, LoadImageFromFile, Normalize, RandomFlip,
-          RandomGrayscale, RandomResize, Resize):
+for t in (CenterCrop, LoadImageFromFile, Normalize, RandomFlip, RandomResize,
+          Resize):
     TRANSFORMS.register_module(module=t)
 
 __all__ = [
@@ -38,5 +42,7 @@ __all__ = [
     'RandomFlip', 'RandomGrayscale', 'RandomResize', 'Resize', 'MultiView',
     'ApplyToList', 'CleanCaption', 'RandomTranslatePad',
     'RandomResizedCropAndInterpolationWithTwoPic', 'get_transform_idx',
-    'remove_transform', 'MAERandomResizedCrop', 'RandomPatchWithLabels', 'PackSelfSupInputs'
+    'remove_transform', 'MAERandomResizedCrop', 'RandomPatchWithLabels', 'PackSelfSupInputs',
+    'LoadImageBytesFromFile', 'TensorResize', 'LoadImageFromCache',
+    'LoadJPEGFromFile'
 ]
@@ -333,7 +333,7 @@ class BaseAugTransform(BaseTransform):
     @cache_randomness
     def random_disable(self):
         """Randomly disable the transform."""
-        return np.random.rand() > self.prob
+        return np.random.random_sample() > self.prob
 
     @cache_randomness
     def random_magnitude(self):
@@ -354,7 +354,7 @@ class BaseAugTransform(BaseTransform):
     @cache_randomness
     def random_negative(self, value):
         """Randomly negative the value."""
-        if np.random.rand() < self.random_negative_prob:
+        if np.random.random_sample() < self.random_negative_prob:
             return -value
         else:
             return value
@@ -0,0 +1,262 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import logging
+from typing import Optional
+
+import mmcv
+import mmengine.fileio as fileio
+import numpy as np
+from mmcv.transforms import BaseTransform
+from mmengine.logging import print_log
+
+from mmpretrain.registry import TRANSFORMS
+
+try:
+    import turbojpeg
+except ImportError:
+    turbojpeg = None
+
+
+@TRANSFORMS.register_module()
+class LoadImageBytesFromFile(BaseTransform):
+    """Load the raw encoded bytes of an image without decoding it.
+
+    The encoded image (usually a JPEG file) is stored as a 1-D ``uint8``
+    array in ``results['img']``, so that the decoding can be postponed to the
+    data preprocessor and done on the whole batch on GPU, see the
+    ``decode_jpeg`` option of :class:`mmpretrain.models.ClsDataPreprocessor`.
+
+    Since the image is not decoded, only transforms which don't touch the
+    pixels (like :class:`PackInputs`) can follow this transform.
+
+    Required Keys:
+
+    - img_path
+
+    Added Keys:
+
+    - img
+
+    Args:
+        ignore_empty (bool): Whether to allow loading empty image or file path
+            not existent. Defaults to False.
+        backend_args (dict, optional): Arguments to instantiate the
+            corresponding backend. Defaults to None.
+    """
+
+    def __init__(self,
+                 ignore_empty: bool = False,
+                 backend_args: Optional[dict] = None) -> None:
+        self.ignore_empty = ignore_empty
+        self.backend_args = backend_args.copy() if backend_args else None
+
+    def transform(self, results: dict) -> Optional[dict]:
+        """Load the encoded image bytes.
+
+        Args:
+            results (dict): Result dict from the dataset.
+
+        Returns:
+            dict: The dict contains the encoded image bytes.
+        """
+        filename = results['img_path']
+        try:
+            img_bytes = fileio.get(filename, backend_args=self.backend_args)
+        except Exception as e:
+            if self.ignore_empty:
+                return None
+            else:
+                raise e
+
+        # Use a writable buffer, otherwise ``torch.from_numpy`` will complain
+        # when packing the inputs.
+        results['img'] = np.frombuffer(bytearray(img_bytes), dtype=np.uint8)
+        return results
+
+    def __repr__(self):
+        repr_str = self.__class__.__name__
+        repr_str += f'(ignore_empty={self.ignore_empty}, '
+        repr_str += f'backend_args={self.backend_args})'
+        return repr_str
+
+
+@TRANSFORMS.register_module()
+class LoadJPEGFromFile(BaseTransform):
+    """Load a JPEG image by calling libjpeg-turbo directly.
+
+    It works like :class:`mmcv.transforms.LoadImageFromFile` with
+    ``color_type='color'``, but decodes the bytes with ``PyTurboJPEG``, which
+    skips the format detection and the extra conversions of the generic
+    decoders, and optionally uses the faster approximate IDCT. Files which
+    are not JPEG are decoded by OpenCV as usual. If ``PyTurboJPEG`` is not
+    installed, all the files are decoded by OpenCV, with a warning.
+
+    Required Keys:
+
+    - img_path
+
+    Modified Keys:
+
+    - img
+    - img_shape
+    - ori_shape
+
+    Args:
+        to_float32 (bool): Whether to convert the loaded image to a float32
+            numpy array. Defaults to False.
+        channel_order (str): The channel order of the loaded image, 'bgr' or
+            'rgb'. Defaults to 'bgr'.
+        fast_dct (bool): Whether to use the fast but less accurate IDCT of
+            libjpeg-turbo. It's usually fine if the image is resized later.
+            Defaults to False.
+        ignore_empty (bool): Whether to allow loading empty image or file path
+            not existent. Defaults to False.
+        backend_args (dict, optional): Arguments to instantiate the
+            corresponding backend. Defaults to None.
+    """
+
+    def __init__(self,
+                 to_float32: bool = False,
+                 channel_order: str = 'bgr',
+                 fast_dct: bool = False,
+                 ignore_empty: bool = False,
+                 backend_args: Optional[dict] = None) -> None:
+        assert channel_order in ('bgr', 'rgb'), \
+            f'Unsupported channel order "{channel_order}".'
+        self.to_float32 = to_float32
+        self.channel_order = channel_order
+        self.fast_dct = fast_dct
+        self.ignore_empty = ignore_empty
+        self.backend_args = backend_args.copy() if backend_args else None
+
+        self._decoder = None
+        if turbojpeg is None:
+            print_log(
+                'PyTurboJPEG is not installed, LoadJPEGFromFile decodes the '
+                'images by OpenCV. Install it by `pip install PyTurboJPEG` '
+                'for faster decoding.',
+                logger='current',
+                level=logging.WARNING)
+            return
+        self._pixel_format = turbojpeg.TJPF_BGR if channel_order == 'bgr' \
+            else turbojpeg.TJPF_RGB
+        self._flags = turbojpeg.TJFLAG_FASTDCT if fast_dct else 0
+
+    def _decode(self, img_bytes: bytes) -> np.ndarray:
+        if turbojpeg is None or img_bytes[:2] != b'\xff\xd8':
+            # Not a JPEG file, or libjpeg-turbo is not available.
+            return mmcv.imfrombytes(
+                img_bytes, channel_order=self.channel_order, backend='cv2')
+        if self._decoder is None:
+            # The decoder holds a library handle which cannot be pickled,
+            # create it in every worker.
+            self._decoder = turbojpeg.TurboJPEG()
+        return self._decoder.decode(
+            img_bytes, pixel_format=self._pixel_format, flags=self._flags)
+
+    def transform(self, results: dict) -> Optional[dict]:
+        """Load and decode the image.
+
+        Args:
+            results (dict): Result dict from the dataset.
+
+        Returns:
+            dict: The dict contains loaded image and meta information.
+        """
+        filename = results['img_path']
+        try:
+            img_bytes = fileio.get(filename, backend_args=self.backend_args)
+            img = self._decode(img_bytes)
+        except Exception as e:
+            if self.ignore_empty:
+                return None
+            else:
+                raise e
+        assert img is not None, f'failed to load image: {filename}'
+        if self.to_float32:
+            img = img.astype(np.float32)
+
+        results['img'] = img
+        results['img_shape'] = img.shape[:2]
+        results['ori_shape'] = img.shape[:2]
+        return results
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_decoder'] = None
+        return state
+
+    def __repr__(self):
+        repr_str = self.__class__.__name__
+        repr_str += f'(to_float32={self.to_float32}, '
+        repr_str += f"channel_order='{self.channel_order}', "
+        repr_str += f'fast_dct={self.fast_dct}, '
+        repr_str += f'ignore_empty={self.ignore_empty}, '
+        repr_str += f'backend_args={self.backend_args})'
+        return repr_str
+
+
+@TRANSFORMS.register_module()
+class LoadImageFromCache(BaseTransform):
+    """Load a pre-processed image from a memory-mapped cache file.
+
+    The cache is a ``.npy`` file of uint8 images with shape (N, C, H, W),
+    indexed by the ``sample_idx`` of the dataset, which can be built by
+    ``tools/misc/cache_dataset.py``. It's only suitable when all the
+    transforms before :class:`PackInputs` are deterministic, like the fixed
+    ``Resize`` of a test pipeline, since the results of them are cached.
+
+    The cache is memory-mapped in copy-on-write mode, so loading an image
+    doesn't copy it. The loaded image is a HWC view of the cached CHW image,
+    so :class:`PackInputs` can convert it to a CHW tensor without any copy.
+
+    Required Keys:
+
+    - sample_idx
+
+    Added Keys:
+
+    - img
+    - img_shape
+    - ori_shape
+
+    Args:
+        cache_file (str): The path of the cache file.
+    """
+
+    def __init__(self, cache_file: str) -> None:
+        self.cache_file = cache_file
+        self._cache = None
+
+    def transform(self, results: dict) -> dict:
+        """Load the cached image.
+
+        Args:
+            results (dict): Result dict from the dataset.
+
+        Returns:
+            dict: The dict contains the loaded image and meta information.
+        """
+        if self._cache is None:
+            # Open the cache lazily, so that every worker maps the file
+            # itself instead of receiving a pickled copy.
+            self._cache = np.load(self.cache_file, mmap_mode='c')
+
+        idx = results['sample_idx']
+        assert idx < len(self._cache), \
+            f'The sample {idx} is out of the cache "{self.cache_file}" ' \
+            f'with {len(self._cache)} images, please rebuild the cache.'
+        img = self._cache[idx].transpose(1, 2, 0)
+        results['img'] = img
+        results['img_shape'] = img.shape[:2]
+        results['ori_shape'] = img.shape[:2]
+        return results
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_cache'] = None
+        return state
+
+    def __repr__(self):
+        repr_str = self.__class__.__name__
+        repr_str += f"(cache_file='{self.cache_file}')"
+        return repr_str
@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import inspect
+import logging
 import math
 import numbers
 import re
@@ -8,14 +9,18 @@ from enum import EnumMeta
 from numbers import Number
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import cv2
 import mmcv
 import mmengine
 import numpy as np
 import torch
 import torchvision
 import torchvision.transforms.functional as F
+from mmcv.image.geometric import cv2_interp_codes
 from mmcv.transforms import BaseTransform
 from mmcv.transforms.utils import cache_randomness
+from mmengine.logging import print_log
+from mmengine.utils import is_seq_of
 from PIL import Image
 from torchvision import transforms
 from torchvision.transforms.transforms import InterpolationMode
@@ -290,6 +295,35 @@ class RandomCrop(BaseTransform):
 
         return offset_h, offset_w, target_h, target_w
 
+    def _get_padding(self, img_shape: Tuple[int, int]) -> Tuple[tuple, tuple]:
+        """Get the paddings of ``padding`` and ``pad_if_needed``.
+
+        Args:
+            img_shape (Tuple[int, int]): The shape (h, w) of the image.
+
+        Returns:
+            Tuple[tuple, tuple]: The two paddings in the order (left, top,
+            right, bottom).
+        """
+        h, w = img_shape
+        if self.padding is None:
+            padding = (0, 0, 0, 0)
+        elif isinstance(self.padding, int):
+            padding = (self.padding, ) * 4
+        elif len(self.padding) == 2:
+            padding = tuple(self.padding) * 2
+        else:
+            padding = tuple(self.padding)
+
+        padding_needed = (0, 0, 0, 0)
+        if self.pad_if_needed:
+            h = h + padding[1] + padding[3]
+            w = w + padding[0] + padding[2]
+            h_pad = math.ceil(max(0, self.crop_size[0] - h) / 2)
+            w_pad = math.ceil(max(0, self.crop_size[1] - w) / 2)
+            padding_needed = (w_pad, h_pad, w_pad, h_pad)
+        return padding, padding_needed
+
     def transform(self, results: dict) -> dict:
         """Transform function to randomly crop images.
 
@@ -301,29 +335,48 @@ class RandomCrop(BaseTransform):
                 key in result dict is updated according to crop size.
         """
         img = results['img']
-        if self.padding is not None:
-            img = mmcv.impad(img, padding=self.padding, pad_val=self.pad_val)
-
-        # pad img if needed
-        if self.pad_if_needed:
-            h_pad = math.ceil(max(0, self.crop_size[0] - img.shape[0]) / 2)
-            w_pad = math.ceil(max(0, self.crop_size[1] - img.shape[1]) / 2)
-
-            img = mmcv.impad(
-                img,
-                padding=(w_pad, h_pad, w_pad, h_pad),
-                pad_val=self.pad_val,
-                padding_mode=self.padding_mode)
-
-        offset_h, offset_w, target_h, target_w = self.rand_crop_params(img)
-        img = mmcv.imcrop(
-            img,
-            np.array([
-                offset_w,
-                offset_h,
-                offset_w + target_w - 1,
-                offset_h + target_h - 1,
-            ]))
+        h, w = img.shape[:2]
+        padding, padding_needed = self._get_padding((h, w))
+        left, top, right, bottom = (
+            a + b for a, b in zip(padding, padding_needed))
+
+        # Only the shape of the padded image is needed to sample the crop.
+        padded_shape = (top + h + bottom, left + w + right) + img.shape[2:]
+        offset_h, offset_w, target_h, target_w = self.rand_crop_params(
+            np.broadcast_to(img[:1, :1], padded_shape))
+
+        # The crop window in the coordinates of the unpadded image.
+        y1, x1 = offset_h - top, offset_w - left
+        y2, x2 = y1 + target_h, x1 + target_w
+
+        padding_mode = self.padding_mode if any(padding_needed) \
+            else 'constant'
+        # Padding the crop is the same as cropping the padded image, unless
+        # the padding reflects the pixels out of the crop, or the edge pixels
+        # are already padded by ``padding``.
+        fusible = padding_mode == 'constant' or (padding_mode == 'edge'
+                                                 and not any(padding))
+        if fusible and y1 < h and x1 < w and y2 > 0 and x2 > 0:
+            img = img[max(y1, 0):min(y2, h), max(x1, 0):min(x2, w)]
+            border = (max(-x1, 0), max(-y1, 0), max(x2 - w, 0),
+                      max(y2 - h, 0))
+            if any(border):
+                img = mmcv.impad(
+                    img,
+                    padding=border,
+                    pad_val=self.pad_val,
+                    padding_mode=padding_mode)
+        else:
+            if any(padding):
+                img = mmcv.impad(img, padding=padding, pad_val=self.pad_val)
+            if any(padding_needed):
+                img = mmcv.impad(
+                    img,
+                    padding=padding_needed,
+                    pad_val=self.pad_val,
+                    padding_mode=self.padding_mode)
+            img = img[offset_h:offset_h + target_h,
+                      offset_w:offset_w + target_w]
         results['img'] = img
         results['img_shape'] = img.shape
 
@@ -409,6 +462,10 @@ class RandomResizedCrop(BaseTransform):
         self.interpolation = interpolation
         self.backend = backend
 
+        self._log_aspect_ratio_range = (math.log(aspect_ratio_range[0]),
+                                        math.log(aspect_ratio_range[1]))
+        self._cv2_interp = cv2_interp_codes[interpolation]
+
     @cache_randomness
     def rand_crop_params(self, img: np.ndarray) -> Tuple[int, int, int, int]:
         """Get parameters for ``crop`` for a random sized crop.
@@ -422,12 +479,18 @@ class RandomResizedCrop(BaseTransform):
         """
         h, w = img.shape[:2]
         area = h * w
+        min_crop, max_crop = self.crop_ratio_range
+        min_log_ratio, max_log_ratio = self._log_aspect_ratio_range
 
         for _ in range(self.max_attempts):
-            target_area = np.random.uniform(*self.crop_ratio_range) * area
-            log_ratio = (math.log(self.aspect_ratio_range[0]),
-                         math.log(self.aspect_ratio_range[1]))
-            aspect_ratio = math.exp(np.random.uniform(*log_ratio))
+            # Draw both random values of an attempt in a single call, which
+            # gives the same values as two `np.random.uniform` calls.
+            rand_crop, rand_ratio = np.random.random_sample(2).tolist()
+            target_area = (min_crop +
+                           (max_crop - min_crop) * rand_crop) * area
+            aspect_ratio = math.exp(min_log_ratio +
+                                    (max_log_ratio - min_log_ratio) *
+                                    rand_ratio)
             target_w = int(round(math.sqrt(target_area * aspect_ratio)))
             target_h = int(round(math.sqrt(target_area / aspect_ratio)))
 
@@ -464,17 +527,18 @@ class RandomResizedCrop(BaseTransform):
         """
         img = results['img']
         offset_h, offset_w, target_h, target_w = self.rand_crop_params(img)
-        img = mmcv.imcrop(
-            img,
-            bboxes=np.array([
-                offset_w, offset_h, offset_w + target_w - 1,
-                offset_h + target_h - 1
-            ]))
-        img = mmcv.imresize(
-            img,
-            tuple(self.scale[::-1]),
-            interpolation=self.interpolation,
-            backend=self.backend)
+        # Resize the crop view directly, OpenCV reads it with the strides of
+        # the original image.
+        img = img[offset_h:offset_h + target_h, offset_w:offset_w + target_w]
+        if self.backend == 'cv2':
+            img = cv2.resize(
+                img, tuple(self.scale[::-1]), interpolation=self._cv2_interp)
+        else:
+            img = mmcv.imresize(
+                img,
+                tuple(self.scale[::-1]),
+                interpolation=self.interpolation,
+                backend=self.backend)
         results['img'] = img
         results['img_shape'] = img.shape
 
@@ -562,8 +626,13 @@ class EfficientNetRandomCrop(RandomResizedCrop):
         min_target_area = self.crop_ratio_range[0] * area
         max_target_area = self.crop_ratio_range[1] * area
 
+        min_ratio, max_ratio = self.aspect_ratio_range
+
         for _ in range(self.max_attempts):
-            aspect_ratio = np.random.uniform(*self.aspect_ratio_range)
+            # Draw both random values of an attempt in a single call, which
+            # gives the same values as two `np.random.uniform` calls.
+            rand_ratio, rand_h = np.random.random_sample(2).tolist()
+            aspect_ratio = min_ratio + (max_ratio - min_ratio) * rand_ratio
             min_target_h = int(
                 round(math.sqrt(min_target_area / aspect_ratio)))
             max_target_h = int(
@@ -579,7 +648,7 @@ class EfficientNetRandomCrop(RandomResizedCrop):
 
             # slightly differs from tf implementation
             target_h = int(
-                round(np.random.uniform(min_target_h, max_target_h)))
+                round(min_target_h + (max_target_h - min_target_h) * rand_h))
             target_w = int(round(target_h * aspect_ratio))
             target_area = target_h * target_w
 
@@ -602,6 +671,7 @@ class EfficientNetRandomCrop(RandomResizedCrop):
 
         offset_h = max(0, int(round((h - crop_size) / 2.)))
         offset_w = max(0, int(round((w - crop_size) / 2.)))
+        crop_size = int(crop_size)
         return offset_h, offset_w, crop_size, crop_size
 
     def __repr__(self):
@@ -679,8 +749,7 @@ class RandomErasing(BaseTransform):
         if isinstance(aspect_range, float):
             aspect_range = min(aspect_range, 1 / aspect_range)
             aspect_range = (aspect_range, 1 / aspect_range)
-        assert isinstance(aspect_range, Sequence) and len(aspect_range) == 2 \
-            and all(isinstance(x, float) for x in aspect_range), \
+        assert is_seq_of(aspect_range, float) and len(aspect_range) == 2, \
             'aspect_range should be a float or Sequence with two float.'
         assert all(x > 0 for x in aspect_range), \
             'aspect_range should be positive.'
@@ -690,14 +759,12 @@ class RandomErasing(BaseTransform):
             'Please select `mode` from ["const", "rand"].'
         if isinstance(fill_color, Number):
             fill_color = [fill_color] * 3
-        assert isinstance(fill_color, Sequence) and len(fill_color) == 3 \
-            and all(isinstance(x, Number) for x in fill_color), \
+        assert is_seq_of(fill_color, Number) and len(fill_color) == 3, \
             'fill_color should be a float or Sequence with three int.'
         if fill_std is not None:
             if isinstance(fill_std, Number):
                 fill_std = [fill_std] * 3
-            assert isinstance(fill_std, Sequence) and len(fill_std) == 3 \
-                and all(isinstance(x, Number) for x in fill_std), \
+            assert is_seq_of(fill_std, Number) and len(fill_std) == 3, \
                 'fill_std should be a float or Sequence with three int.'
 
         self.erase_prob = erase_prob
@@ -708,40 +775,55 @@ class RandomErasing(BaseTransform):
         self.fill_color = fill_color
         self.fill_std = fill_std
 
+        # convert the aspect ratio to log space to equally handle width and
+        # height.
+        self._log_aspect_range = np.log(
+            np.array(aspect_range, dtype=np.float32))
+        self._fill_color_arr = np.array(fill_color, dtype=np.uint8)
+        self._fill_mean_arr = np.array(fill_color, dtype=np.float64)
+        self._fill_std_arr = None if fill_std is None else np.array(
+            fill_std, dtype=np.float64)
+
     def _fill_pixels(self, img, top, left, h, w):
         """Fill pixels to the patch of image."""
+        region = img[top:top + h, left:left + w]
         if self.mode == 'const':
-            patch = np.empty((h, w, 3), dtype=np.uint8)
-            patch[:, :] = np.array(self.fill_color, dtype=np.uint8)
+            # Broadcast the color into the image directly.
+            region[...] = self._fill_color_arr
+            return img
         elif self.fill_std is None:
             # Uniform distribution
-            patch = np.random.uniform(0, 256, (h, w, 3)).astype(np.uint8)
+            patch = np.random.uniform(0, 256, (h, w, 3))
         else:
             # Normal distribution
-            patch = np.random.normal(self.fill_color, self.fill_std, (h, w, 3))
-            patch = np.clip(patch.astype(np.int32), 0, 255).astype(np.uint8)
-
-        img[top:top + h, left:left + w] = patch
+            patch = np.random.normal(self._fill_mean_arr, self._fill_std_arr,
+                                     (h, w, 3))
+            patch = patch.astype(np.int32)
+            np.clip(patch, 0, 255, out=patch)
+
+        if img.dtype == np.uint8:
+            # Cast while writing into the image, without an uint8 patch.
+            np.copyto(region, patch, casting='unsafe')
+        else:
+            region[...] = patch.astype(np.uint8)
         return img
 
     @cache_randomness
     def random_disable(self):
         """Randomly disable the transform."""
-        return np.random.rand() > self.erase_prob
+        return np.random.random_sample() > self.erase_prob
 
     @cache_randomness
     def random_patch(self, img_h, img_w):
         """Randomly generate patch the erase."""
-        # convert the aspect ratio to log space to equally handle width and
-        # height.
-        log_aspect_range = np.log(
-            np.array(self.aspect_range, dtype=np.float32))
-        aspect_ratio = np.exp(np.random.uniform(*log_aspect_range))
+        # Use the scalar math functions, which are much faster than the numpy
+        # ufuncs on a single value.
+        aspect_ratio = math.exp(np.random.uniform(*self._log_aspect_range))
         area = img_h * img_w
         area *= np.random.uniform(self.min_area_ratio, self.max_area_ratio)
 
-        h = min(int(round(np.sqrt(area * aspect_ratio))), img_h)
-        w = min(int(round(np.sqrt(area / aspect_ratio))), img_w)
+        h = min(int(round(math.sqrt(area * aspect_ratio))), img_h)
+        w = min(int(round(math.sqrt(area / aspect_ratio))), img_w)
         top = np.random.randint(0, img_h - h) if img_h > h else 0
         left = np.random.randint(0, img_w - w) if img_w > w else 0
         return top, left, h, w
@@ -831,6 +913,7 @@ class EfficientNetCenterCrop(BaseTransform):
         self.crop_padding = crop_padding
         self.interpolation = interpolation
         self.backend = backend
+        self._cv2_interp = cv2_interp_codes[interpolation]
 
     def transform(self, results: dict) -> dict:
         """Transform function to randomly resized crop images.
@@ -852,19 +935,20 @@ class EfficientNetCenterCrop(BaseTransform):
 
         offset_h = max(0, int(round((h - crop_size) / 2.)))
         offset_w = max(0, int(round((w - crop_size) / 2.)))
+        crop_size = int(crop_size)
 
         # crop the image
-        img = mmcv.imcrop(
-            img,
-            bboxes=np.array([
-                offset_w, offset_h, offset_w + crop_size - 1,
-                offset_h + crop_size - 1
-            ]))
+        img = img[offset_h:offset_h + crop_size, offset_w:offset_w + crop_size]
         # resize image
-        img = mmcv.imresize(
-            img, (self.crop_size, self.crop_size),
-            interpolation=self.interpolation,
-            backend=self.backend)
+        if self.backend == 'cv2':
+            img = cv2.resize(
+                img, (self.crop_size, self.crop_size),
+                interpolation=self._cv2_interp)
+        else:
+            img = mmcv.imresize(
+                img, (self.crop_size, self.crop_size),
+                interpolation=self.interpolation,
+                backend=self.backend)
         results['img'] = img
         results['img_shape'] = img.shape
 
@@ -925,16 +1009,27 @@ class ResizeEdge(BaseTransform):
         self.scale = scale
         self.backend = backend
         self.interpolation = interpolation
+        # Some interpolation methods are only supported by pillow.
+        self._cv2_interp = cv2_interp_codes.get(interpolation)
 
     def _resize_img(self, results: dict) -> None:
         """Resize images with ``results['scale']``."""
 
-        img, w_scale, h_scale = mmcv.imresize(
-            results['img'],
-            results['scale'],
-            interpolation=self.interpolation,
-            return_scale=True,
-            backend=self.backend)
+        if self.backend == 'cv2' and self._cv2_interp is not None:
+            h, w = results['img'].shape[:2]
+            img = cv2.resize(
+                results['img'],
+                results['scale'],
+                interpolation=self._cv2_interp)
+            w_scale = results['scale'][0] / w
+            h_scale = results['scale'][1] / h
+        else:
+            img, w_scale, h_scale = mmcv.imresize(
+                results['img'],
+                results['scale'],
+                interpolation=self.interpolation,
+                return_scale=True,
+                backend=self.backend)
         results['img'] = img
         results['img_shape'] = img.shape[:2]
         results['scale'] = img.shape[:2][::-1]
@@ -983,6 +1078,105 @@ class ResizeEdge(BaseTransform):
         return repr_str
 
 
+@TRANSFORMS.register_module()
+class TensorResize(BaseTransform):
+    """Resize images to a fixed scale with the uint8 tensor kernels of
+    torchvision.
+
+    The resizing is done by :func:`torchvision.transforms.functional.resize`
+    directly on the uint8 image, which uses the vectorized uint8 kernels
+    (AVX2 if available) of torchvision and is much faster than the float
+    path. The image is kept in uint8 and the normalization is left to the
+    data preprocessor.
+
+    The resized image is a HWC view of a contiguous CHW tensor buffer, so it
+    still works with the other numpy-based transforms, and
+    :class:`PackInputs` can convert it to a CHW tensor without a copy.
+
+    **Required Keys:**
+
+    - img
+
+    **Modified Keys:**
+
+    - img
+    - img_shape
+
+    **Added Keys:**
+
+    - scale
+    - scale_factor
+
+    Args:
+        scale (int | Sequence[int]): Target size in (w, h) order, the same as
+            :class:`mmcv.transforms.Resize`. If it's an int, resize the image
+            to a square of this size.
+        interpolation (str): Interpolation method, accepted values are
+            "nearest", "bilinear" and "bicubic". Defaults to 'bilinear'.
+        antialias (bool): Whether to apply antialiasing when downsampling,
+            which makes the results close to the Pillow backend.
+            Defaults to True.
+    """
+
+    def __init__(self,
+                 scale: Union[int, Sequence[int]],
+                 interpolation: str = 'bilinear',
+                 antialias: bool = True) -> None:
+        if isinstance(scale, int):
+            scale = (scale, scale)
+        assert len(scale) == 2, \
+            f'"scale" should be an int or a pair of ints, but got {scale}.'
+        assert interpolation in ('nearest', 'bilinear', 'bicubic'), \
+            f'Unsupported interpolation "{interpolation}".'
+        self.scale = tuple(scale)
+        self.interpolation = interpolation
+        self.antialias = antialias
+        self._mode = _interpolation_modes_from_str(interpolation)
+
+    def transform(self, results: Dict) -> Dict:
+        """Transform function to resize images.
+
+        Args:
+            results (dict): Result dict from loading pipeline.
+
+        Returns:
+            dict: Resized results, 'img', 'scale', 'scale_factor',
+            'img_shape' keys are updated in result dict.
+        """
+        img = results['img']
+        h, w = img.shape[:2]
+        target_w, target_h = self.scale
+
+        if (h, w) != (target_h, target_w):
+            tensor = torch.from_numpy(np.ascontiguousarray(img))
+            tensor = tensor.unsqueeze(0) if img.ndim == 2 \
+                else tensor.permute(2, 0, 1)
+            tensor = F.resize(
+                tensor, [target_h, target_w],
+                interpolation=self._mode,
+                antialias=self.antialias)
+            img = tensor[0].numpy() if img.ndim == 2 \
+                else tensor.permute(1, 2, 0).numpy()
+
+        results['img'] = img
+        results['img_shape'] = img.shape[:2]
+        results['scale'] = self.scale
+        results['scale_factor'] = (target_w / w, target_h / h)
+        return results
+
+    def __repr__(self):
+        """Print the basic information of the transform.
+
+        Returns:
+            str: Formatted string.
+        """
+        repr_str = self.__class__.__name__
+        repr_str += f'(scale={self.scale}, '
+        repr_str += f'interpolation={self.interpolation}, '
+        repr_str += f'antialias={self.antialias})'
+        return repr_str
+
+
 @TRANSFORMS.register_module()
 class ColorJitter(BaseTransform):
     """Randomly change the brightness, contrast and saturation of an image.
@@ -1157,9 +1351,15 @@ class Lighting(BaseTransform):
 
         self.eigval = np.array(eigval)
         self.eigvec = np.array(eigvec)
+        assert self.eigvec.shape == (3, len(self.eigval)), \
+            'eigvec should be a 3 x len(eigval) matrix.'
         self.alphastd = alphastd
         self.to_rgb = to_rgb
 
+        # The lighting shift is ``eigvec @ (alpha * eigval)``, scale the
+        # eigenvectors by the eigenvalues in advance.
+        self._eigvec_scaled = self.eigvec * self.eigval
+
     def transform(self, results: Dict) -> Dict:
         """Transform function to resize images.
 
@@ -1172,12 +1372,17 @@ class Lighting(BaseTransform):
         assert 'img' in results, 'No `img` field in the input.'
 
         img = results['img']
-        img_lighting = mmcv.adjust_lighting(
-            img,
-            self.eigval,
-            self.eigvec,
-            alphastd=self.alphastd,
-            to_rgb=self.to_rgb)
+        # Same as ``mmcv.adjust_lighting``, but the float64 shift is added in
+        # place to a single float32 copy of the image, and the uint8 outputs
+        # are clipped instead of wrapping around.
+        img_lighting = img.astype(np.float32)
+        if self.to_rgb:
+            cv2.cvtColor(img_lighting, cv2.COLOR_BGR2RGB, img_lighting)
+
+        alpha = np.random.normal(0, self.alphastd, len(self.eigval))
+        img_lighting += self._eigvec_scaled @ alpha
+        if img.dtype == np.uint8:
+            np.clip(img_lighting, 0, 255, out=img_lighting)
         results['img'] = img_lighting.astype(img.dtype)
         return results
 
@@ -1195,6 +1400,90 @@ class Lighting(BaseTransform):
         return repr_str
 
 
+@TRANSFORMS.register_module()
+class RandomGrayscale(mmcv.transforms.RandomGrayscale):
+    """Randomly convert image to grayscale with a probability.
+
+    It's the same as :class:`mmcv.transforms.RandomGrayscale`, but computes
+    the gray image without a float copy of the whole image, and with
+    ``keep_channels=True`` repeats it to all channels by a single copy,
+    instead of stacking several copies of it.
+
+    Required Key:
+
+    - img
+
+    Modified Key:
+
+    - img
+
+    Args:
+        prob (float): Probability that image should be converted to
+            grayscale. Defaults to 0.1.
+        keep_channels (bool): Whether keep channel number the same as
+            input. Defaults to False.
+        channel_weights (tuple): The grayscale weights of each channel,
+            and the weights will be normalized. For example, (1, 2, 1)
+            will be normalized as (0.25, 0.5, 0.25). Defaults to
+            (1., 1., 1.).
+        color_format (str): Color format set to be any of 'bgr',
+            'rgb', 'hsv'. Note: 'hsv' image will be transformed into 'bgr'
+            format no matter whether it is grayscaled. Defaults to 'bgr'.
+    """
+
+    def __init__(self,
+                 prob: float = 0.1,
+                 keep_channels: bool = False,
+                 channel_weights: Sequence[float] = (1., 1., 1.),
+                 color_format: str = 'bgr') -> None:
+        super().__init__(
+            prob=prob,
+            keep_channels=keep_channels,
+            channel_weights=channel_weights,
+            color_format=color_format)
+        self._normalized_weights = (
+            np.array(self.channel_weights) / sum(self.channel_weights))
+
+    def transform(self, results: dict) -> dict:
+        """Apply random grayscale on results.
+
+        Args:
+            results (dict): Result dict contains the data to transform.
+
+        Returns:
+           dict: Results with grayscale image.
+        """
+        img = results['img']
+        # convert hsv to bgr
+        if self.color_format == 'hsv':
+            img = mmcv.hsv2bgr(img)
+        img = img[..., None] if img.ndim == 2 else img
+        num_output_channels = img.shape[2]
+        if self._random_prob() >= self.prob or num_output_channels == 1:
+            # Most images are not converted, don't copy them if they are
+            # already uint8.
+            results['img'] = img.astype(np.uint8, copy=False)
+            return results
+
+        assert num_output_channels == len(self.channel_weights), \
+            'The length of ``channel_weights`` are supposed to be ' \
+            f'num_output_channels, but got {len(self.channel_weights)}' \
+            ' instead.'
+        # Accumulate the weighted channels one by one, which gives the same
+        # values as summing the weighted image along the channels, without
+        # the float64 copy of the whole image.
+        gray = img[..., 0] * self._normalized_weights[0]
+        for i in range(1, num_output_channels):
+            gray += img[..., i] * self._normalized_weights[i]
+        gray = gray.astype(np.uint8)
+        if self.keep_channels:
+            # The following transforms may modify the image in place, so
+            # don't return a broadcast view.
+            gray = np.repeat(gray[:, :, None], num_output_channels, axis=2)
+        results['img'] = gray
+        return results
+
+
 # 'Albu' is used in previous versions of mmpretrain, here is for compatibility
 # users can use both 'Albumentations' and 'Albu'.
 @TRANSFORMS.register_module(['Albumentations', 'Albu'])
@@ -1245,6 +1534,17 @@ class Albumentations(BaseTransform):
         keymap (Optional[Dict]): Mapping of mmpretrain to albumentations
             fields, in format {'input key':'albumentation-style key'}.
             Defaults to None.
+        crop_first (bool): Whether to move the crop transforms (in
+            :attr:`CROP_TRANSFORMS`) ahead of the others, so that the other
+            transforms process fewer pixels. Note that it changes the results
+            of the transforms depending on the image size or the borders,
+            like rotation. Defaults to False.
+
+    Note:
+        Put the ``Albumentations`` before any transform converting the image
+        to float, like ``Normalize``. Most OpenCV kernels used by
+        albumentations are several times faster on ``uint8`` images, and a
+        warning is logged once if the input image is not ``uint8``.
 
     Example:
         >>> import mmcv
@@ -1278,7 +1578,13 @@ class Albumentations(BaseTransform):
         (375, 500, 3)
     """
 
-    def __init__(self, transforms: List[Dict], keymap: Optional[Dict] = None):
+    CROP_TRANSFORMS = ('RandomCrop', 'RandomResizedCrop', 'RandomSizedCrop',
+                       'CenterCrop', 'Crop')
+
+    def __init__(self,
+                 transforms: List[Dict],
+                 keymap: Optional[Dict] = None,
+                 crop_first: bool = False):
         if albumentations is None:
             raise RuntimeError('albumentations is not installed')
         else:
@@ -1288,16 +1594,37 @@ class Albumentations(BaseTransform):
         if keymap is not None:
             assert isinstance(keymap, dict), 'keymap must be None or a dict. '
 
+        if crop_first:
+            # A stable sort keeps the order inside the crops and the others.
+            transforms = sorted(
+                transforms, key=lambda t: not self._is_crop(t))
         self.transforms = transforms
 
-        self.aug = albu_Compose(
-            [self.albu_builder(t) for t in self.transforms])
+        albu_transforms = [self.albu_builder(t) for t in self.transforms]
+        self.aug = albu_Compose(albu_transforms)
+        # Skip albumentations if no transform can be applied. The transforms
+        # with ``always_apply=True`` are applied even if ``p=0``.
+        self._noop = all(
+            t.p == 0 and not getattr(t, 'always_apply', False)
+            for t in albu_transforms)
 
         if not keymap:
             self.keymap_to_albu = dict(img='image')
         else:
             self.keymap_to_albu = keymap
         self.keymap_back = {v: k for k, v in self.keymap_to_albu.items()}
+        # The key pairs to rename, resolved once for the mapper.
+        self._pairs_to_albu = tuple(
+            (k, v) for k, v in self.keymap_to_albu.items() if k != v)
+        self._pairs_back = tuple((v, k) for k, v in self._pairs_to_albu)
+        self._dtype_warned = False
+
+    def _is_crop(self, cfg: Dict) -> bool:
+        """Whether the transform config is a crop transform."""
+        obj_type = cfg.get('type') if isinstance(cfg, dict) else None
+        if inspect.isclass(obj_type):
+            obj_type = obj_type.__name__
+        return obj_type in self.CROP_TRANSFORMS
 
     def albu_builder(self, cfg: Dict):
         """Import a module from albumentations.
@@ -1334,19 +1661,28 @@ class Albumentations(BaseTransform):
     def mapper(d, keymap):
         """Dictionary mapper.
 
-        Renames keys according to keymap provided.
+        Renames keys according to keymap provided, in place.
         Args:
             d (dict): old dict
-            keymap (dict): {'old_key':'new_key'}
+            keymap (dict | Sequence[tuple]): {'old_key':'new_key'}, or the
+                pairs of (old_key, new_key).
         Returns:
-            dict: new dict.
+            dict: the renamed dict.
         """
-
-        updated_dict = {}
-        for k, v in zip(d.keys(), d.values()):
-            new_k = keymap.get(k, k)
-            updated_dict[new_k] = d[k]
-        return updated_dict
+        if isinstance(keymap, dict):
+            keymap = keymap.items()
+        if len(keymap) == 1:
+            # The most common case, like the default {'img': 'image'}.
+            (k, new_k), = keymap
+            if k in d:
+                d[new_k] = d.pop(k)
+            return d
+
+        # Pop all the old keys before setting the new ones, in case that
+        # some keys are swapped.
+        renamed = {new_k: d.pop(k) for k, new_k in keymap if k in d}
+        d.update(renamed)
+        return d
 
     def transform(self, results: Dict) -> Dict:
         """Transform function to perform albumentations transforms.
@@ -1359,13 +1695,26 @@ class Albumentations(BaseTransform):
                 updated in result dict.
         """
         assert 'img' in results, 'No `img` field in the input.'
+        if results['img'].dtype != np.uint8 and not self._dtype_warned:
+            print_log(
+                'The input image of Albumentations is '
+                f'{results["img"].dtype}, which is much slower than uint8. '
+                'Please put Albumentations before the transforms converting '
+                'the image to float.',
+                logger='current',
+                level=logging.WARNING)
+            self._dtype_warned = True
+
+        if self._noop:
+            results['img_shape'] = results['img'].shape[:2]
+            return results
 
         # dict to albumentations format
-        results = self.mapper(results, self.keymap_to_albu)
+        results = self.mapper(results, self._pairs_to_albu)
         results = self.aug(**results)
 
         # back to the original format
-        results = self.mapper(results, self.keymap_back)
+        results = self.mapper(results, self._pairs_back)
         results['img_shape'] = results['img'].shape[:2]
 
         return results
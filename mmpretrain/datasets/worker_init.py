@@ -0,0 +1,96 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import random
+import warnings
+from typing import List
+
+import numpy as np
+import torch
+from mmengine.dist import get_rank
+
+from mmpretrain.registry import FUNCTIONS
+
+
+def _physical_cpus() -> List[int]:
+    """Get the available CPUs of the process, keeping one logical CPU per
+    physical core."""
+    cpus = sorted(os.sched_getaffinity(0))
+    physical_cpus = []
+    for cpu in cpus:
+        siblings_file = f'/sys/devices/system/cpu/cpu{cpu}/topology/' \
+            'thread_siblings_list'
+        try:
+            with open(siblings_file) as f:
+                siblings = f.read().strip()
+        except OSError:
+            return cpus
+        # The format is like "0,8" or "0-1".
+        first = int(siblings.replace('-', ',').split(',')[0])
+        if first == cpu or first not in cpus:
+            physical_cpus.append(cpu)
+    return physical_cpus
+
+
+@FUNCTIONS.register_module()
+def affinity_worker_init_fn(worker_id: int, offset: int = 1) -> None:
+    """Pin every dataloader worker to its own physical CPU core.
+
+    The workers (of all the processes on the node, according to the
+    ``LOCAL_RANK`` environment variable) are assigned to different physical
+    cores, skipping the SMT siblings. The first ``offset`` cores of every
+    process are left to the main process. If there are not enough cores, the
+    remaining workers are not pinned.
+
+    Use it in the dataloader config by:
+
+    .. code-block:: python
+
+        worker_init_fn=dict(type='mmpretrain.affinity_worker_init_fn')
+
+    Since it replaces the default ``worker_init_fn`` of MMEngine, it also
+    seeds ``numpy``, ``random`` and ``torch`` of every worker, from the worker
+    seed generated by PyTorch and the rank, which is reproducible if the
+    runner is seeded, and different for every worker of every rank.
+
+    Note:
+        The cores only depend on ``worker_id``, ``offset`` and the number of
+        workers, so different dataloaders with the same arguments, like the
+        train and the val dataloaders with ``persistent_workers=True``, pin
+        their workers to the same cores. It doesn't matter if they don't
+        load at the same time, as the train workers wait during validation.
+        Otherwise, give the other dataloader a larger ``offset``, like
+        ``offset=1 + num_workers`` of the train dataloader, with a single
+        process per node.
+
+    Args:
+        worker_id (int): Worker id in [0, num_workers - 1].
+        offset (int): The number of cores reserved for the main process.
+            Defaults to 1.
+    """
+    num_workers = torch.utils.data.get_worker_info().num_workers
+    # The worker seed of PyTorch is ``base_seed + worker_id``, and the base
+    # seed is the same on all the ranks if the runner doesn't use different
+    # seeds for the ranks. Mix the rank in like ``default_worker_init_fn`` of
+    # MMEngine, so that the workers of different ranks don't get the same
+    # random augmentations.
+    seed = (torch.initial_seed() + num_workers * get_rank()) % 2**32
+    np.random.seed(seed)
+    random.seed(seed)
+    torch.manual_seed(seed)
+
+    if not hasattr(os, 'sched_setaffinity'):
+        # Not available on Windows and macOS.
+        return
+
+    local_rank = int(os.environ.get('LOCAL_RANK', 0))
+    cpus = _physical_cpus()
+    index = local_rank * (num_workers + offset) + offset + worker_id
+    if index < len(cpus):
+        os.sched_setaffinity(0, {cpus[index]})
+    elif index == len(cpus) or worker_id == 0:
+        # Only warn once, by the first worker that cannot be pinned.
+        warnings.warn(
+            f'Only {len(cpus)} physical cores are available for '
+            f'{num_workers} dataloader workers (with {offset} cores reserved '
+            'for the main process), please reduce `num_workers`. Some '
+            'workers are not pinned to a core.')
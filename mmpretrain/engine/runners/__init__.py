@@ -1,4 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from .prefetch_loop import CUDAPrefetcher, PrefetchEpochBasedTrainLoop
 from .retrieval_loop import RetrievalTestLoop, RetrievalValLoop
 
-__all__ = ['RetrievalTestLoop', 'RetrievalValLoop']
+__all__ = [
+    'RetrievalTestLoop', 'RetrievalValLoop', 'CUDAPrefetcher',
+    'PrefetchEpochBasedTrainLoop'
+]
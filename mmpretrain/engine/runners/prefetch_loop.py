@@ -0,0 +1,116 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Iterator, Sequence
+
+import torch
+from mmengine.runner import EpochBasedTrainLoop
+
+from mmpretrain.registry import LOOPS
+
+
+class CUDAPrefetcher:
+    """Copy the next batch of a dataloader to GPU while the current batch is
+    being consumed.
+
+    The copy is issued on a side CUDA stream, so it overlaps with the
+    forward and backward of the current batch. It needs ``pin_memory=True``
+    in the dataloader to be really asynchronous. Without CUDA, it iterates
+    the dataloader as usual.
+
+    Args:
+        dataloader (Iterable): The dataloader to wrap.
+        keys (Sequence[str]): The keys of the batch to copy to GPU. The
+            others (like the data samples) are left to the data preprocessor.
+            Defaults to ``('inputs', )``.
+    """
+
+    def __init__(self, dataloader, keys: Sequence[str] = ('inputs', )):
+        self.dataloader = dataloader
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.dataloader)
+
+    def __iter__(self) -> Iterator[dict]:
+        if not torch.cuda.is_available():
+            yield from self.dataloader
+            return
+
+        stream = torch.cuda.Stream()
+        iterator = iter(self.dataloader)
+        next_batch = self._preload(iterator, stream)
+        while next_batch is not None:
+            current_stream = torch.cuda.current_stream()
+            current_stream.wait_stream(stream)
+            batch = next_batch
+            # The tensors are allocated on the side stream but used on the
+            # current stream, record it to avoid the memory being reused.
+            for key in self.keys:
+                if key in batch:
+                    self._apply(batch[key],
+                                lambda x: x.record_stream(current_stream))
+            next_batch = self._preload(iterator, stream)
+            yield batch
+
+    def _preload(self, iterator, stream):
+        try:
+            batch = next(iterator)
+        except StopIteration:
+            return None
+        with torch.cuda.stream(stream):
+            for key in self.keys:
+                if key in batch:
+                    batch[key] = self._apply(
+                        batch[key], lambda x: x.cuda(non_blocking=True))
+        return batch
+
+    @classmethod
+    def _apply(cls, data, func):
+        """Apply ``func`` to all tensors in ``data``."""
+        if isinstance(data, torch.Tensor):
+            return func(data)
+        elif isinstance(data, (list, tuple)):
+            return type(data)(cls._apply(item, func) for item in data)
+        elif isinstance(data, dict):
+            return {k: cls._apply(v, func) for k, v in data.items()}
+        return data
+
+
+@LOOPS.register_module()
+class PrefetchEpochBasedTrainLoop(EpochBasedTrainLoop):
+    """Epoch-based training loop which copies the next batch to GPU in
+    advance.
+
+    It's the same as :class:`mmengine.runner.EpochBasedTrainLoop`, except
+    that the dataloader is wrapped by a :class:`CUDAPrefetcher`, which hides
+    the host-to-device copy of the inputs behind the computation of the
+    previous iteration. Use it by ``train_cfg = dict(
+    type='PrefetchEpochBasedTrainLoop', max_epochs=...)``, together with
+    ``pin_memory=True`` in the train dataloader.
+
+    Note:
+        Don't use it with the ``decode_jpeg`` option of
+        :class:`mmpretrain.models.ClsDataPreprocessor`, which requires the
+        encoded images on CPU.
+
+    Args:
+        runner (Runner): A reference of runner.
+        dataloader (Dataloader or dict): A dataloader object or a dict to
+            build a dataloader.
+        max_epochs (int): Total training epochs.
+        val_begin (int): The epoch that begins validating. Defaults to 1.
+        val_interval (int): Validation interval. Defaults to 1.
+        dynamic_intervals (List[Tuple[int, int]], optional): The
+            first element in the tuple is a milestone and the second
+            element is a interval. The interval is used after the
+            corresponding milestone. Defaults to None.
+    """
+
+    def run_epoch(self) -> None:
+        """Iterate one epoch."""
+        self.runner.call_hook('before_train_epoch')
+        self.runner.model.train()
+        for idx, data_batch in enumerate(CUDAPrefetcher(self.dataloader)):
+            self.run_iter(idx, data_batch)
+
+        self.runner.call_hook('after_train_epoch')
+        self._epoch += 1
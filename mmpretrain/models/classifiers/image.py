@@ -84,6 +84,11 @@ class ImageClassifier(BaseClassifier):
             self._register_load_state_dict_pre_hook(
                 self.backbone._checkpoint_filter)
 
+        # Keep the weights in the same memory format as the inputs, so that
+        # the convolutions don't need to convert the layout.
+        if getattr(self.data_preprocessor, 'to_channels_last', False):
+            self.to(memory_format=torch.channels_last)
+
     def forward(self,
                 inputs: torch.Tensor,
                 data_samples: Optional[List[DataSample]] = None,
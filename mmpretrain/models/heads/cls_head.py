@@ -80,15 +80,26 @@ class ClsHead(BaseModule):
         losses = self._get_loss(cls_score, data_samples, **kwargs)
         return losses
 
+    @staticmethod
+    def _get_targets(data_samples: List[DataSample]) -> torch.Tensor:
+        """Pack the targets of the data samples into a batch tensor.
+
+        The ``gt_score`` of the samples are used if available, otherwise the
+        ``gt_label``. Both are views of a single batch tensor scattered by
+        :class:`mmpretrain.models.ClsDataPreprocessor`, so the packing is a
+        single copy on the device.
+        """
+        if 'gt_score' in data_samples[0]:
+            # Batch augmentation may convert labels to one-hot format scores.
+            return torch.stack([i.gt_score for i in data_samples])
+        else:
+            return torch.cat([i.gt_label for i in data_samples])
+
     def _get_loss(self, cls_score: torch.Tensor,
                   data_samples: List[DataSample], **kwargs):
         """Unpack data samples and compute loss."""
         # Unpack data samples and pack targets
-        if 'gt_score' in data_samples[0]:
-            # Batch augmentation may convert labels to one-hot format scores.
-            target = torch.stack([i.gt_score for i in data_samples])
-        else:
-            target = torch.cat([i.gt_label for i in data_samples])
+        target = self._get_targets(data_samples)
 
         # compute loss
         losses = dict()
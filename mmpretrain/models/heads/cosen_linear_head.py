@@ -4,6 +4,7 @@ from mmpretrain.structures import DataSample
 import torch
 import torch.nn as nn
 
+from mmpretrain.evaluation.metrics import Accuracy
 from mmpretrain.registry import MODELS
 from .linear_head import LinearClsHead
 from ..losses.cosen_ce_loss import CoSenCrossEntropyLoss
@@ -32,11 +33,7 @@ class CoSenLinearClsHead(LinearClsHead):
                   data_samples: List[DataSample], **kwargs):
         """Unpack data samples and compute loss."""
         # Unpack data samples and pack targets
-        if 'gt_score' in data_samples[0]:
-            # Batch augmentation may convert labels to one-hot format scores.
-            target = torch.stack([i.gt_score for i in data_samples])
-        else:
-            target = torch.cat([i.gt_label for i in data_samples])
+        target = self._get_targets(data_samples)
 
         # compute loss
         losses = dict()
@@ -3,6 +3,7 @@ import torch.nn as nn
 from typing import Optional, List
 from mmpretrain.structures import DataSample
 
+from mmpretrain.evaluation.metrics import Accuracy
 from mmpretrain.registry import MODELS
 from .linear_head import LinearClsHead
 from ..losses.dos_loss import DOSLoss
@@ -70,6 +71,7 @@ class DOSHead(LinearClsHead):
         """
 
 
+        # DOSLoss works on hard labels, ignore the scores of batch augments.
         target = torch.cat([i.gt_label for i in data_samples])
 
         losses = dict()
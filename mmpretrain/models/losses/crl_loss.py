@@ -1,13 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import torch
 import torch.nn as nn
 import torch.nn.functional as F
 
 from mmpretrain.registry import MODELS
+from .cross_entropy_loss import binary_cross_entropy, soft_cross_entropy
 from .utils import weight_reduce_loss
 
-import torch
-import heapq
-
 
 def cross_entropy(pred,
                   label,
@@ -31,6 +30,14 @@ def cross_entropy(pred,
     Returns:
         torch.Tensor: The calculated loss
     """
+    # Let PyTorch reduce the loss in the same kernel if possible. With
+    # class_weight, the mean of PyTorch is weighted, which is different.
+    if weight is None and avg_factor is None and (
+            reduction == 'sum' or reduction == 'mean'
+            and class_weight is None):
+        return F.cross_entropy(
+            pred, label, weight=class_weight, reduction=reduction)
+
     # element-wise losses
     loss = F.cross_entropy(pred, label, weight=class_weight, reduction='none')
 
@@ -43,43 +50,56 @@ def cross_entropy(pred,
     return loss
 
 
-def seminal_triplet_loss(triplets, label):
-    """ Calculate the seminal triplet ranking loss (see paper) 
-
-    Args: 
-        triplets (torch.Tensor): The generated triplets with shape (dim, C) where C is the number of classes.
-    """
-
-    print(triplets.shape)
-    print(label.shape) 
-
-    print(triplets[ : , 0 ])
-    print(triplets[ : , 1 ])
-    print(torch.abs(triplets[ : , 0 ] - triplets[ : , 1 ]))
-    
-    loss =  torch.sum(torch.maximum(0, m + torch.abs(triplets[ : , 0 ] - triplets[ : , 1]) - torch.abs(triplets[ : , 0 ] - triplets [ : , 2 ])))
-
-
-    #loss =  torch.sum(torch.maximum(0, m + torch.abs(triplets[ : , label ] - triplets[ : , 4 + label ]) - torch.abs(triplets[ : , label ] - triplets [ : , 8 + label ])))
-    return loss / triplets.shape[0]
+def seminal_triplet_loss(anchor, pos, neg, valid, margin):
+    """Calculate the class-level triplet ranking loss of CRL.
 
+    For every anchor, all the combinations of its hard positives and hard
+    negatives form the triplets.
 
+    Args:
+        anchor (torch.Tensor): The scores of the anchors on their classes
+            with shape (A, ).
+        pos (torch.Tensor): The scores of the hard positives of every anchor
+            with shape (A, P).
+        neg (torch.Tensor): The scores of the hard negatives of every anchor
+            with shape (A, Q).
+        valid (torch.Tensor): The mask of the valid triplets with shape
+            (A, P, Q).
+        margin (float): The margin between the positive and the negative
+            distances.
 
+    Returns:
+        torch.Tensor: The loss averaged over the valid triplets.
+    """
+    anchor = anchor[:, None, None]
+    pos_dist = torch.abs(anchor - pos[:, :, None])
+    neg_dist = torch.abs(anchor - neg[:, None, :])
+    loss = (margin + pos_dist - neg_dist).clamp(min=0)
+    return (loss * valid).sum() / valid.sum().clamp(min=1)
 
 
 @MODELS.register_module()
 class CRLLoss(nn.Module):
     """ Loss has a lot of similarities with CrossEntropyLoss
-        Loss based on epoch-based training based on: 
+        Loss based on epoch-based training based on:
         Imbalanced Deep Learning by Minority Class Incremental Rectification by Qi Dong et al.
         (only class based sampling with relative comparison)
-        Requirements: 
+        Requirements:
             new (non-default parameters in the init)
 
+    The samples of the majority classes are trained by the cross entropy
+    loss. For every minority class, the hard negatives (the samples of other
+    classes predicted as the class with the highest scores) and the hard
+    positives (the samples of the class with the lowest scores on it) are
+    mined from the batch, and the samples of the class are trained by the
+    triplet ranking loss with them.
+
     Args:
         min_classes (List[int]): The labels of the minority classes for the algorithm (only
             these will be used for mining hard samples, in the paper there is a criterion for that)
         k (int): The k in top-k mining (how many hard positives and negatives will be mined)
+        margin (float): The margin of the triplet ranking loss.
+            Defaults to 0.5.
         use_sigmoid (bool): Whether the prediction uses sigmoid
             of softmax. Defaults to False.
         use_soft (bool): Whether to use the soft version of CrossEntropyLoss.
@@ -95,8 +115,9 @@ class CRLLoss(nn.Module):
     """
 
     def __init__(self,
-                 min_classes, 
-                 k, 
+                 min_classes,
+                 k,
+                 margin=0.5,
                  use_sigmoid=False,
                  use_soft=False,
                  reduction='mean',
@@ -112,8 +133,12 @@ class CRLLoss(nn.Module):
 
         self.reduction = reduction
         self.loss_weight = loss_weight
-        self.class_weight = class_weight
-        self.pos_weight = pos_weight
+        # Keep the weights as buffers instead of building them every forward.
+        for name, value in (('class_weight', class_weight),
+                            ('pos_weight', pos_weight)):
+            if value is not None:
+                value = torch.tensor(value, dtype=torch.float32)
+            self.register_buffer(name, value, persistent=False)
 
         if self.use_sigmoid:
             self.cls_criterion = binary_cross_entropy
@@ -122,9 +147,67 @@ class CRLLoss(nn.Module):
         else:
             self.cls_criterion = cross_entropy
 
-        self.k = k 
-        self.min_classes = torch.tensor(min_classes).to(torch.device('cuda')) 
-
+        self.k = k
+        self.margin = margin
+        # Buffers follow the module to the device of the model.
+        self.register_buffer(
+            'min_classes', torch.tensor(min_classes), persistent=False)
+        # The lookup table from the label to its index in ``min_classes``,
+        # -1 for the majority classes. The labels out of range are clamped to
+        # the last entry, which is always -1.
+        min_class_index = torch.full((max(min_classes) + 2, ), -1)
+        min_class_index[self.min_classes] = torch.arange(len(min_classes))
+        self.register_buffer(
+            'min_class_index', min_class_index, persistent=False)
+
+    def _min_class_index(self, label):
+        """Get the index of every label in ``min_classes``, -1 for the
+        majority classes."""
+        return self.min_class_index[label.clamp(
+            max=self.min_class_index.size(0) - 1)]
+
+    def mine_hard_samples(self, cls_score, label, label_index=None):
+        """Mine the top-k hard negatives and hard positives of every minority
+        class in the batch.
+
+        Args:
+            cls_score (torch.Tensor): The prediction with shape (N, C).
+            label (torch.Tensor): The gt label with shape (N, ).
+            label_index (torch.Tensor, optional): The index of every label in
+                ``min_classes``, -1 for the majority classes. Defaults to None,
+                which means looking it up from ``label``.
+
+        Returns:
+            tuple: The indices of the hard negatives and the hard positives,
+            both with shape (M, k), where M is the number of minority classes,
+            and the masks of the valid ones among them.
+        """
+        scores = cls_score.detach()
+        k = min(self.k, scores.size(0))
+        if label_index is None:
+            label_index = self._min_class_index(label)
+        # (M, N) mask of the samples of every minority class.
+        is_class = label_index[None, :] == torch.arange(
+            self.min_classes.size(0), device=label.device)[:, None]
+
+        # hard negatives: the wrong predictions of the class with the highest
+        # scores.
+        max_pred, max_pred_lab = scores.max(dim=1)
+        neg_mask = (max_pred_lab[None, :] == self.min_classes[:, None]) \
+            & ~is_class
+        neg_ind = max_pred.expand_as(neg_mask).masked_fill(
+            ~neg_mask, float('-inf')).topk(k, dim=1).indices
+        neg_valid = neg_mask.gather(1, neg_ind)
+
+        # hard positives: the samples of the class with the lowest scores on
+        # it. Contrast to paper, every sample of the class can be a hard
+        # positive.
+        class_scores = scores[:, self.min_classes].t()
+        pos_ind = (-class_scores).masked_fill(
+            ~is_class, float('-inf')).topk(k, dim=1).indices
+        pos_valid = is_class.gather(1, pos_ind)
+
+        return neg_ind, neg_valid, pos_ind, pos_valid
 
     def forward(self,
                 cls_score,
@@ -138,136 +221,60 @@ class CRLLoss(nn.Module):
             reduction_override if reduction_override else self.reduction)
 
         if self.class_weight is not None:
-            class_weight = cls_score.new_tensor(self.class_weight)
+            class_weight = self.class_weight.to(cls_score)
         else:
             class_weight = None
 
         # only BCE loss has pos_weight
         if self.pos_weight is not None and self.use_sigmoid:
-            pos_weight = cls_score.new_tensor(self.pos_weight)
-            kwargs.update({'pos_weight': pos_weight})
-        else:
-            pos_weight = None
-
-        
-        ### MINE HARD SAMPLES
-
-        #print(cls_score)
-        #print(label)
-
-        num_classes = cls_score.shape[1]
-        
-        # get tensor where to store the hard samples, 0 -> hard negatives, 1-> hard positives 
-        hard_samples = [[[] for _ in range(num_classes) ] for _ in range(2)]
-        #print(hard_samples)
-
-        ## MINE HARD NEGATIVES
-
-        # get label for which the maximum prediction was made and the maximum prediction score
-        max_pred, max_pred_lab = cls_score.max(dim=1)
-        #print(max_pred_lab)
-
-        # check if predictions are for min_classes and are wrong 
-        max_thrs_mask = torch.logical_and(torch.isin(max_pred_lab, self.min_classes), torch.ne(max_pred_lab, label))
-        # with threshold checking: use torch.gt(max_pred, self.max_thrs)
-        #print(max_thrs_mask)
-
-        # get indices where wrong prediction scores are made 
-        hard_neg_ind = torch.nonzero(max_thrs_mask)
-        #print(hard_neg_ind)
-
-        # write hard negative samples into hard_samples)
-        for i, idx in enumerate(hard_neg_ind):
-            if (len(hard_samples[0][max_pred_lab[idx]]) >= self.k) and  (max_pred[idx] > hard_samples[0][max_pred_lab[idx]][0][0]):
-                heapq.heappop(hard_samples[0][max_pred_lab[idx]])
-                heapq.heappush(hard_samples[0][max_pred_lab[idx]], [max_pred[idx], idx])
-            elif len(hard_samples[0][max_pred_lab[idx]]) < self.k:
-                heapq.heappush(hard_samples[0][max_pred_lab[idx]], [max_pred[idx], idx])
-        #print(hard_samples)
-
-
-        ## MINE HARD POSITIVES
-
-        # get mask of where the min_class examples are in the batch 
-        min_labels_mask = torch.isin(label, self.min_classes)
-        #print(min_labels_mask)
-        
-        # get the indices of the location of min_classes in the batch
-        ind = torch.nonzero(min_labels_mask).view(-1)
-        #print(ind)
-        
-        # contrast to paper: every min class example counts as hard positive (maybe change with threshold see threshold for hard negatives)
-        # get concrete labels of min classes
-        min_labels = label[min_labels_mask]
-        #print(min_labels)
-
-        # get prediction score for min classes
-        min_pred = cls_score[ min_labels_mask, min_labels]
-        #print(min_pred)
-
-
-        # write hard positives into hard_samples (need a max heap, -> minus before min_pred to convert to min heap)
-        for i in range(len(ind)):
-            if (len(hard_samples[1][min_labels[i]]) >= self.k)  and  (-min_pred[i] < hard_samples[1][min_labels[i]][0][0]):
-                heapq.heappop(hard_samples[1][min_labels[i]])
-                heapq.heappush(hard_samples[1][min_labels[i]], [ - min_pred[i], ind[i] ])
-            elif len(hard_samples[1][min_labels[i]]) < self.k:
-                heapq.heappush(hard_samples[1][min_labels[i]], [ - min_pred[i], ind[i] ])
-        #print(hard_samples)
-
-        
-        # WHAT TO DO WITH CLASSES WHICH DO NOT HAVE HARD NEGATIVES OR HARD POSITIVES ?
-        # approach: if hard negative empty: fill with one hot of the corresponding class 
-        #           if hard positive empty. fill with inverse one hot of the corresponding class 
-        for i in range(2):
-            for lab, arr in enumerate(hard_samples[i]):
-                if len(arr) == 0:
-                    if i == 0:
-                        arr.append([ F.one_hot(torch.tensor(lab), num_classes = num_classes), -1 ])
-                    if i == 1:
-                        arr.append([ 1 - F.one_hot(torch.tensor(lab), num_classes = num_classes), -1 ])
-        
-        # for all indices that are not in ind (so are not from min_classes) 
-        #print(cls_score[ ~ min_labels_mask])
-        #print(label[ ~ min_labels_mask])
-
-        loss_mjr = self.loss_weight * self.cls_criterion(
-            cls_score[ ~ min_labels_mask],
-            label[ ~ min_labels_mask],
-            weight,
+            kwargs.update({'pos_weight': self.pos_weight.to(cls_score)})
+
+        label_index = self._min_class_index(label)
+        neg_ind, neg_valid, pos_ind, pos_valid = self.mine_hard_samples(
+            cls_score, label, label_index)
+
+        # Every minority sample is an anchor, ``rows`` are the indices of
+        # their classes in ``min_classes``.
+        mjr_mask = label_index < 0
+        anchor_ind = torch.nonzero(~mjr_mask, as_tuple=True)[0]
+        rows = label_index[anchor_ind]
+
+        # Mask out the minority samples instead of indexing the majority ones,
+        # which would wait for the GPU to know their number.
+        mjr_weight = mjr_mask.float()
+        if weight is not None:
+            mjr_weight = mjr_weight * weight.float()
+        loss_mjr = self.cls_criterion(
+            cls_score,
+            label,
+            mjr_weight,
             class_weight=class_weight,
-            reduction=reduction,
-            avg_factor=avg_factor,
+            reduction='none',
             **kwargs)
-        
-        # form the triplets
-        # create triplet tensor with shape ( (# of min_class samples in the batch) * k * k,  3 * num_classes)
-
-        #calculate dimension #triplets = torch.zeros((len(ind) * self.k * self.k, 3 * num_classes))
-        dim = 0
-        for i in range(len(hard_samples[0])):
-            #print((min_labels == i).sum().item())
-            #print(len(hard_samples[0][i]) * len(hard_samples[1][i]) * (min_labels == i).sum().item())
-            dim += len(hard_samples[0][i]) * len(hard_samples[1][i]) * (min_labels == i).sum().item()
-        #triplets = torch.zeros((dim, 3 * num_classes))
-        triplets = torch.zeros((dim, 3))
-
-        # for each min sample get each combination of hard negative and hard positive for that class and write that in 1 row
-        # if we do make triplet tensor with self.k: last rows could be zero because we do not mine k hard negs or hard pos for each class. 
-        #print(cls_score[min_labels_mask])
-
-        idx = 0
-        for i, min_sample in enumerate(cls_score[min_labels_mask]):
-            lab = label[min_labels_mask][i]
-
-            for k, hard_pos in enumerate(hard_samples[1][lab]):
-                for j, hard_neg in enumerate(hard_samples[0][lab]):
-                    triplets[idx, 0 : num_classes] = min_sample[lab]
-                    triplets[idx, num_classes : num_classes + num_classes] = cls_score[hard_neg[1], lab] if hard_neg[1] > 0 else hard_neg[0][lab]
-                    triplets[idx, 2 * num_classes : 3 * num_classes] = cls_score[hard_pos[1], lab] if hard_pos[1] > 0 else hard_pos[0][lab]
-                    idx += 1
-        #print(triplets) 
-        
-        loss_mnr = seminal_triplet_loss(triplets, label[min_labels_mask])
+        if reduction == 'mean' and avg_factor is None:
+            # average over the majority samples, an empty batch gives zero.
+            avg_factor = mjr_mask.sum().clamp(min=1) * \
+                loss_mjr.shape[1:].numel()
+        loss_mjr = self.loss_weight * weight_reduce_loss(
+            loss_mjr, reduction=reduction, avg_factor=avg_factor)
+
+        # form the triplets of every anchor with the hard positives and hard
+        # negatives of its class.
+        anchor_lab = self.min_classes[rows]
+        anchor = cls_score[anchor_ind, anchor_lab]
+        pos = cls_score[pos_ind[rows], anchor_lab[:, None]]
+        neg = cls_score[neg_ind[rows], anchor_lab[:, None]]
+        pos_valid = pos_valid[rows]
+        neg_valid = neg_valid[rows]
+
+        # If a class has no hard negative, use a virtual negative sample with
+        # score 1 on the class.
+        no_neg = ~neg_valid.any(dim=1, keepdim=True)
+        first = torch.arange(neg.size(1), device=neg.device) == 0
+        neg = torch.where(no_neg & first, torch.ones_like(neg), neg)
+        neg_valid = neg_valid | (no_neg & first)
+
+        valid = pos_valid[:, :, None] & neg_valid[:, None, :]
+        loss_mnr = seminal_triplet_loss(anchor, pos, neg, valid, self.margin)
 
         return loss_mjr + loss_mnr
@@ -28,6 +28,7 @@ class ClsDataPreprocessor(BaseDataPreprocessor):
     It provides the data pre-processing as follows
 
     - Collate and move data to the target device.
+    - Optionally decode JPEG images and resize images on the target device.
     - Pad inputs to the maximum size of current batch with defined
       ``pad_value``. The padding size can be divisible by a defined
       ``pad_size_divisor``
@@ -52,6 +53,28 @@ class ClsDataPreprocessor(BaseDataPreprocessor):
         batch_augments (dict, optional): The batch augmentations settings,
             including "augments" and "probs". For more details, see
             :class:`mmpretrain.models.RandomBatchAugment`.
+        decode_jpeg (bool): Whether the inputs are encoded JPEG bytes (see
+            :class:`mmpretrain.datasets.LoadImageBytesFromFile`) and should
+            be decoded on the target device by
+            :func:`torchvision.io.decode_jpeg`, which uses nvJPEG on GPU.
+            The decoded images are already in RGB order, so ``to_rgb`` is
+            ignored in this case. Defaults to False.
+        non_blocking (bool): Whether to copy the data to the target device
+            asynchronously. It only takes effect with ``pin_memory=True`` in
+            the dataloader. Defaults to False.
+        resize_scale (Sequence[int], optional): If specified, resize the
+            images to this scale in (w, h) order on the target device before
+            the normalization. It's usually used together with
+            ``decode_jpeg`` to move the whole image pre-processing to GPU.
+            Defaults to None.
+        resize_interpolation (str): The interpolation method of the resizing,
+            accepted values are "nearest", "bilinear" and "bicubic".
+            Defaults to 'bilinear'.
+        to_channels_last (bool): Whether to output the batch inputs in the
+            channels last memory format (NHWC), which is faster for the
+            convolutions with mixed precision on Tensor Cores.
+            :class:`mmpretrain.models.ImageClassifier` converts its weights
+            to the same memory format when it's enabled. Defaults to False.
     """
 
     def __init__(self,
@@ -62,23 +85,38 @@ class ClsDataPreprocessor(BaseDataPreprocessor):
                  to_rgb: bool = False,
                  to_onehot: bool = False,
                  num_classes: Optional[int] = None,
-                 batch_augments: Optional[dict] = None):
-        super().__init__()
+                 batch_augments: Optional[dict] = None,
+                 decode_jpeg: bool = False,
+                 non_blocking: bool = False,
+                 resize_scale: Optional[Sequence[int]] = None,
+                 resize_interpolation: str = 'bilinear',
+                 to_channels_last: bool = False):
+        super().__init__(non_blocking)
         self.pad_size_divisor = pad_size_divisor
         self.pad_value = pad_value
         self.to_rgb = to_rgb
         self.to_onehot = to_onehot
         self.num_classes = num_classes
+        self.decode_jpeg = decode_jpeg
+        self.resize_scale = resize_scale
+        self.resize_interpolation = resize_interpolation
+        self.to_channels_last = to_channels_last
+        if resize_scale is not None:
+            assert isinstance(resize_scale, Sequence) and \
+                len(resize_scale) == 2, \
+                '`resize_scale` should be a pair of (w, h).'
+            assert resize_interpolation in ('nearest', 'bilinear', 'bicubic')
 
         if mean is not None:
             assert std is not None, 'To enable the normalization in ' \
                 'preprocessing, please specify both `mean` and `std`.'
             # Enable the normalization in preprocessing.
             self._enable_normalize = True
-            self.register_buffer('mean',
-                                 torch.tensor(mean).view(-1, 1, 1), False)
-            self.register_buffer('std',
-                                 torch.tensor(std).view(-1, 1, 1), False)
+            mean = torch.tensor(mean, dtype=torch.float32).view(-1, 1, 1)
+            std = torch.tensor(std, dtype=torch.float32).view(-1, 1, 1)
+            self.register_buffer('mean', mean, False)
+            self.register_buffer('std', std, False)
+            self.register_buffer('inv_std', 1. / std, False)
         else:
             self._enable_normalize = False
 
@@ -105,20 +143,26 @@ class ClsDataPreprocessor(BaseDataPreprocessor):
         Returns:
             dict: Data in the same format as the model input.
         """
-        inputs = self.cast_data(data['inputs'])
+        if self.decode_jpeg:
+            inputs = self.decode_inputs(data['inputs'])
+        else:
+            inputs = self.cast_data(data['inputs'])
+        # The decoded images are already in RGB order.
+        to_rgb = self.to_rgb and not self.decode_jpeg
 
         if isinstance(inputs, torch.Tensor):
             # The branch if use `default_collate` as the collate_fn in the
             # dataloader.
 
+            # ------ Resize ------
+            inputs = self._resize(inputs)
+
             # ------ To RGB ------
-            if self.to_rgb and inputs.size(1) == 3:
+            if to_rgb and inputs.size(1) == 3:
                 inputs = inputs.flip(1)
 
             # -- Normalization ---
-            inputs = inputs.float()
-            if self._enable_normalize:
-                inputs = (inputs - self.mean) / self.std
+            inputs = self._normalize(inputs)
 
             # ------ Padding -----
             if self.pad_size_divisor > 1:
@@ -138,20 +182,25 @@ class ClsDataPreprocessor(BaseDataPreprocessor):
 
             processed_inputs = []
             for input_ in inputs:
+                # ------ Resize ------
+                input_ = self._resize(input_)
+
                 # ------ To RGB ------
-                if self.to_rgb and input_.size(0) == 3:
+                if to_rgb and input_.size(0) == 3:
                     input_ = input_.flip(0)
 
                 # -- Normalization ---
-                input_ = input_.float()
-                if self._enable_normalize:
-                    input_ = (input_ - self.mean) / self.std
+                input_ = self._normalize(input_)
 
                 processed_inputs.append(input_)
             # Combine padding and stack
             inputs = stack_batch(processed_inputs, self.pad_size_divisor,
                                  self.pad_value)
 
+        # ---- Memory Format ----
+        if self.to_channels_last and inputs.dim() == 4:
+            inputs = inputs.contiguous(memory_format=torch.channels_last)
+
         data_samples = data.get('data_samples', None)
         sample_item = data_samples[0] if data_samples is not None else None
 
@@ -162,10 +211,10 @@ class ClsDataPreprocessor(BaseDataPreprocessor):
             if 'gt_label' in sample_item:
                 gt_labels = [sample.gt_label for sample in data_samples]
                 batch_label, label_indices = cat_batch_labels(gt_labels)
-                batch_label = batch_label.to(self.device)
+                batch_label = self.cast_data(batch_label)
             if 'gt_score' in sample_item:
                 gt_scores = [sample.gt_score for sample in data_samples]
-                batch_score = torch.stack(gt_scores).to(self.device)
+                batch_score = self.cast_data(torch.stack(gt_scores))
             elif self.to_onehot and 'gt_label' in sample_item:
                 assert batch_label is not None, \
                     'Cannot generate onehot format labels because no labels.'
@@ -196,6 +245,49 @@ class ClsDataPreprocessor(BaseDataPreprocessor):
 
         return {'inputs': inputs, 'data_samples': data_samples}
 
+    def _resize(self, inputs: torch.Tensor) -> torch.Tensor:
+        """Resize the images to ``resize_scale`` if specified."""
+        if self.resize_scale is None:
+            return inputs
+        from torchvision.transforms import InterpolationMode
+        from torchvision.transforms.functional import resize
+
+        w, h = self.resize_scale
+        if inputs.shape[-2:] == (h, w):
+            return inputs
+        return resize(
+            inputs, [h, w],
+            interpolation=InterpolationMode(self.resize_interpolation),
+            antialias=True)
+
+    def _normalize(self, inputs: torch.Tensor) -> torch.Tensor:
+        """Cast the inputs to float32 and normalize them.
+
+        The subtraction casts integer inputs to float32 by type promotion,
+        so no separate cast kernel is needed, and the multiplication is done
+        in place on its output. Floating point inputs are cast first, so
+        that the outputs are float32 whatever the input dtype is.
+        """
+        if not self._enable_normalize:
+            return inputs.float()
+        if inputs.is_floating_point():
+            inputs = inputs.to(self.mean.dtype)
+        return (inputs - self.mean).mul_(self.inv_std)
+
+    def decode_inputs(self, inputs: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Decode a batch of encoded JPEG images on the target device.
+
+        Args:
+            inputs (List[torch.Tensor]): The encoded images, every one is a
+                1-D uint8 tensor on CPU.
+
+        Returns:
+            List[torch.Tensor]: The decoded RGB images with shape (3, H, W).
+        """
+        from torchvision.io import ImageReadMode, decode_jpeg
+        return decode_jpeg(
+            list(inputs), mode=ImageReadMode.RGB, device=self.device)
+
 
 @MODELS.register_module()
 class SelfSupDataPreprocessor(ImgDataPreprocessor):
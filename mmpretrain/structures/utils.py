@@ -25,7 +25,7 @@ def format_label(value: LABEL_TYPE) -> torch.Tensor:
     """Convert various python types to label-format tensor.
 
     Supported types are: :class:`numpy.ndarray`, :class:`torch.Tensor`,
-    :class:`Sequence`, :class:`int`.
+    :class:`Sequence`, :class:`int` and numpy integer scalars.
 
     Args:
         value (torch.Tensor | numpy.ndarray | Sequence | int): Label value.
@@ -34,16 +34,18 @@ def format_label(value: LABEL_TYPE) -> torch.Tensor:
         :obj:`torch.Tensor`: The foramtted label tensor.
     """
 
+    # Fast path of the most common single label, skip the other type checks.
+    if isinstance(value, (int, np.integer)):
+        return torch.tensor([int(value)], dtype=torch.long)
+
     # Handle single number
     if isinstance(value, (torch.Tensor, np.ndarray)) and value.ndim == 0:
-        value = int(value.item())
+        return torch.tensor([int(value.item())], dtype=torch.long)
 
     if isinstance(value, np.ndarray):
         value = torch.from_numpy(value).to(torch.long)
     elif isinstance(value, Sequence) and not is_str(value):
         value = torch.tensor(value).to(torch.long)
-    elif isinstance(value, int):
-        value = torch.LongTensor([value])
     elif not isinstance(value, torch.Tensor):
         raise TypeError(f'Type {type(value)} is not an available label type.')
     assert value.ndim == 1, \
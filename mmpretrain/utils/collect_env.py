@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import mmcv
+import PIL
 from mmengine.utils import get_git_hash
 from mmengine.utils.dl_utils import collect_env as collect_base_env
 
@@ -10,7 +11,38 @@ def collect_env(with_torch_comiling_info=False):
     """Collect the information of the running environments."""
     env_info = collect_base_env()
     env_info['MMCV'] = mmcv.__version__
+    env_info['Pillow'] = _pillow_info()
+    if 'OpenCV' in env_info:
+        env_info['OpenCV'] += _opencv_ipp_info()
     if not with_torch_comiling_info:
         env_info.pop('PyTorch compiling details')
     env_info['MMPreTrain'] = mmpretrain.__version__ + '+' + get_git_hash()[:7]
     return env_info
+
+
+def _pillow_info():
+    """Get the Pillow version and the enabled acceleration.
+
+    The versions of Pillow-SIMD end with ``.post*``.
+    """
+    from PIL import features
+
+    info = PIL.__version__
+    if '.post' in info:
+        info += ' (SIMD)'
+    if features.check_feature('libjpeg_turbo'):
+        info += ', libjpeg-turbo'
+    return info
+
+
+def _opencv_ipp_info():
+    """Get whether OpenCV uses Intel IPP, which accelerates ``cv2.resize``
+    and the other image operations of the ``cv2`` backend."""
+    import cv2
+
+    try:
+        if cv2.ipp.useIPP():
+            return f' ({cv2.ipp.getIppVersion()})'
+    except (AttributeError, cv2.error):
+        pass
+    return ' (without IPP)'
@@ -0,0 +1,135 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import pickle
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import mmcv
+import numpy as np
+import pytest
+
+from mmpretrain.registry import TRANSFORMS
+
+
+class TestLoadImageBytesFromFile(TestCase):
+
+    def test_transform(self):
+        img_path = osp.join(osp.dirname(__file__), '../../data/color.jpg')
+        transform = TRANSFORMS.build(dict(type='LoadImageBytesFromFile'))
+        results = transform({'img_path': img_path})
+        with open(img_path, 'rb') as f:
+            target = f.read()
+        self.assertEqual(results['img'].dtype, np.uint8)
+        self.assertEqual(results['img'].ndim, 1)
+        self.assertEqual(results['img'].tobytes(), target)
+        self.assertTrue(results['img'].flags.writeable)
+
+        # test ignore_empty
+        transform = TRANSFORMS.build(
+            dict(type='LoadImageBytesFromFile', ignore_empty=True))
+        self.assertIsNone(transform({'img_path': 'not_exist.jpg'}))
+
+    def test_repr(self):
+        transform = TRANSFORMS.build(dict(type='LoadImageBytesFromFile'))
+        self.assertEqual(
+            repr(transform),
+            'LoadImageBytesFromFile(ignore_empty=False, backend_args=None)')
+
+
+def _turbojpeg_available():
+    try:
+        import turbojpeg
+        turbojpeg.TurboJPEG()
+    except Exception:
+        return False
+    return True
+
+
+class TestLoadJPEGFromFileFallback(TestCase):
+
+    def test_transform(self):
+        # Without PyTurboJPEG, the images are decoded by OpenCV.
+        img_path = osp.join(osp.dirname(__file__), '../../data/color.jpg')
+        with patch('mmpretrain.datasets.transforms.loading.turbojpeg', None):
+            transform = TRANSFORMS.build(
+                dict(type='LoadJPEGFromFile', channel_order='rgb'))
+            results = transform({'img_path': img_path})
+        target = mmcv.imread(img_path, channel_order='rgb')
+        np.testing.assert_array_equal(results['img'], target)
+        self.assertEqual(results['img_shape'], target.shape[:2])
+
+
+@pytest.mark.skipif(
+    not _turbojpeg_available(), reason='No available libjpeg-turbo.')
+class TestLoadJPEGFromFile(TestCase):
+
+    def test_transform(self):
+        img_path = osp.join(osp.dirname(__file__), '../../data/color.jpg')
+        transform = TRANSFORMS.build(dict(type='LoadJPEGFromFile'))
+        results = transform({'img_path': img_path})
+        target = mmcv.imread(img_path)
+        self.assertEqual(results['img'].shape, target.shape)
+        self.assertEqual(results['img_shape'], target.shape[:2])
+        self.assertEqual(results['img_shape'], results['ori_shape'])
+        diff = np.abs(results['img'].astype(int) - target.astype(int))
+        self.assertLessEqual(diff.mean(), 1.)
+
+        # test rgb order and float32
+        transform = TRANSFORMS.build(
+            dict(type='LoadJPEGFromFile', channel_order='rgb',
+                 to_float32=True, fast_dct=True))
+        results = transform({'img_path': img_path})
+        self.assertEqual(results['img'].dtype, np.float32)
+        diff = np.abs(results['img'] - target[..., ::-1])
+        self.assertLessEqual(diff.mean(), 2.)
+        # The decoder won't be pickled.
+        self.assertIsNone(pickle.loads(pickle.dumps(transform))._decoder)
+
+        # test ignore_empty
+        transform = TRANSFORMS.build(
+            dict(type='LoadJPEGFromFile', ignore_empty=True))
+        self.assertIsNone(transform({'img_path': 'not_exist.jpg'}))
+
+    def test_repr(self):
+        transform = TRANSFORMS.build(dict(type='LoadJPEGFromFile'))
+        self.assertEqual(
+            repr(transform), "LoadJPEGFromFile(to_float32=False, "
+            "channel_order='bgr', fast_dct=False, ignore_empty=False, "
+            'backend_args=None)')
+
+
+class TestLoadImageFromCache(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = osp.join(self.tmpdir.name, 'cache.npy')
+        self.images = np.random.randint(0, 256, (4, 3, 16, 24), np.uint8)
+        np.save(self.cache_file, self.images)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_transform(self):
+        cfg = dict(type='LoadImageFromCache', cache_file=self.cache_file)
+        transform = TRANSFORMS.build(cfg)
+        results = transform({'sample_idx': 2})
+        self.assertEqual(results['img'].shape, (16, 24, 3))
+        self.assertEqual(results['img_shape'], (16, 24))
+        self.assertEqual(results['ori_shape'], (16, 24))
+        np.testing.assert_array_equal(results['img'],
+                                      self.images[2].transpose(1, 2, 0))
+        # The cache is mapped in copy-on-write mode.
+        self.assertTrue(results['img'].flags.writeable)
+
+        # The opened cache won't be pickled.
+        self.assertIsNone(pickle.loads(pickle.dumps(transform))._cache)
+
+        with self.assertRaisesRegex(AssertionError, 'rebuild the cache'):
+            transform({'sample_idx': 4})
+
+    def test_repr(self):
+        cfg = dict(type='LoadImageFromCache', cache_file='cache.npy')
+        transform = TRANSFORMS.build(cfg)
+        self.assertEqual(
+            repr(transform), "LoadImageFromCache(cache_file='cache.npy')")
@@ -110,6 +110,35 @@ class TestRandomCrop(TestCase):
         results = transform(results)
         self.assertTupleEqual(results['img'].shape, (256, 256, 3))
 
+        # test the crop is the same as cropping the padded image.
+        import mmcv
+        img = np.random.randint(0, 256, (20, 30, 3), np.uint8)
+        for padding_mode in ['constant', 'edge', 'reflect', 'symmetric']:
+            for padding in [None, 3]:
+                cfg = dict(
+                    type='RandomCrop',
+                    crop_size=(28, 24),
+                    padding=padding,
+                    pad_if_needed=True,
+                    pad_val=(1, 2, 3),
+                    padding_mode=padding_mode)
+                transform = TRANSFORMS.build(cfg)
+                padded = img if padding is None else mmcv.impad(
+                    img, padding=padding, pad_val=(1, 2, 3))
+                h_pad = math.ceil((28 - padded.shape[0]) / 2)
+                padded = mmcv.impad(
+                    padded,
+                    padding=(0, h_pad, 0, h_pad),
+                    pad_val=(1, 2, 3),
+                    padding_mode=padding_mode)
+                with patch.object(
+                        transform,
+                        'rand_crop_params',
+                        return_value=(0, 2, 28, 24)):
+                    results = transform(dict(img=img.copy()))
+                np.testing.assert_array_equal(results['img'],
+                                              padded[:28, 2:26])
+
     def test_repr(self):
         cfg = dict(type='RandomCrop', crop_size=224)
         transform = TRANSFORMS.build(cfg)
@@ -333,6 +362,52 @@ class TestResizeEdge(TestCase):
             'interpolation=bilinear)')
 
 
+class TestTensorResize(TestCase):
+
+    def test_transform(self):
+        img = np.random.randint(0, 256, (128, 256, 3), np.uint8)
+
+        # test resize to (w, h)
+        cfg = dict(type='TensorResize', scale=(64, 32))
+        transform = TRANSFORMS.build(cfg)
+        results = transform(dict(img=img.copy()))
+        self.assertTupleEqual(results['img'].shape, (32, 64, 3))
+        self.assertEqual(results['img'].dtype, np.uint8)
+        self.assertTupleEqual(results['img_shape'], (32, 64))
+        self.assertTupleEqual(results['scale'], (64, 32))
+        self.assertTupleEqual(results['scale_factor'], (0.25, 0.25))
+
+        # test bicubic interpolation of int scale, and the result is close
+        # to the pillow backend.
+        cfg = dict(type='TensorResize', scale=64, interpolation='bicubic')
+        transform = TRANSFORMS.build(cfg)
+        results = transform(dict(img=img.copy()))
+        self.assertTupleEqual(results['img'].shape, (64, 64, 3))
+        target = np.array(Image.fromarray(img).resize((64, 64), Image.BICUBIC))
+        diff = np.abs(results['img'].astype(int) - target.astype(int))
+        self.assertLessEqual(diff.max(), 2)
+
+        # test grayscale image
+        results = transform(dict(img=img[..., 0].copy()))
+        self.assertTupleEqual(results['img'].shape, (64, 64))
+
+        # test no resize is needed
+        results = transform(dict(img=img[:64, :64].copy()))
+        np.testing.assert_array_equal(results['img'], img[:64, :64])
+
+        # test invalid interpolation
+        with self.assertRaisesRegex(AssertionError, 'Unsupported'):
+            cfg = dict(type='TensorResize', scale=64, interpolation='area')
+            TRANSFORMS.build(cfg)
+
+    def test_repr(self):
+        cfg = dict(type='TensorResize', scale=(64, 32))
+        transform = TRANSFORMS.build(cfg)
+        self.assertEqual(
+            repr(transform), 'TensorResize(scale=(64, 32), '
+            'interpolation=bilinear, antialias=True)')
+
+
 class TestEfficientNetCenterCrop(TestCase):
 
     def test_assertion(self):
@@ -666,6 +741,38 @@ class TestLighting(TestCase):
         self.assertEqual(results['img'].dtype, ori_img.dtype)
         assert np.equal(results['img'], ori_img).all()
 
+    def test_same_as_mmcv(self):
+        import mmcv
+
+        # The same as the clipped results of ``mmcv.adjust_lighting``, the
+        # float images are kept in range, so the clip doesn't change them.
+        rng = np.random.RandomState(0)
+        imgs = [
+            rng.randint(0, 256, (64, 64, 3)).astype(np.uint8),
+            rng.uniform(50, 200, (64, 64, 3)).astype(np.float32),
+        ]
+        for img, to_rgb, alphastd in [(imgs[0], False, 25.5),
+                                      (imgs[0], True, 25.5),
+                                      (imgs[1], False, 1.0),
+                                      (imgs[1], True, 1.0)]:
+            cfg = copy.deepcopy(self.DEFAULT_ARGS)
+            cfg['to_rgb'] = to_rgb
+            cfg['alphastd'] = alphastd
+            transform = TRANSFORMS.build(cfg)
+            for seed in range(50):
+                np.random.seed(seed)
+                results = transform(dict(img=img.copy()))
+                np.random.seed(seed)
+                expect = np.clip(
+                    mmcv.adjust_lighting(
+                        img.copy(),
+                        transform.eigval,
+                        transform.eigvec,
+                        alphastd=alphastd,
+                        to_rgb=to_rgb), 0, 255).astype(img.dtype)
+                self.assertEqual(results['img'].dtype, img.dtype)
+                np.testing.assert_array_equal(results['img'], expect)
+
     def test_repr(self):
         cfg = copy.deepcopy(self.DEFAULT_ARGS)
         transform = TRANSFORMS.build(cfg)
@@ -675,6 +782,49 @@ class TestLighting(TestCase):
             '-0.5675, 0.7192, 0.4009]], alphastd=25.5, to_rgb=False)')
 
 
+class TestRandomGrayscale(TestCase):
+
+    def test_transform(self):
+        from mmcv.transforms import RandomGrayscale as MMCVRandomGrayscale
+        ori_img = np.random.randint(0, 256, (32, 48, 3), np.uint8)
+        cfg = dict(type='RandomGrayscale', prob=1., channel_weights=(1, 2, 1))
+
+        # test the same results as MMCV
+        for keep_channels in [True, False]:
+            for weights in [(1, 2, 1), (1., 1., 1.), (0.299, 0.587, 0.114)]:
+                cfg['keep_channels'] = keep_channels
+                cfg['channel_weights'] = weights
+                transform = TRANSFORMS.build(cfg)
+                self.assertEqual(type(transform).__module__,
+                                 'mmpretrain.datasets.transforms.processing')
+                results = transform(dict(img=ori_img.copy()))
+                expect = MMCVRandomGrayscale(
+                    prob=1., channel_weights=weights,
+                    keep_channels=keep_channels)(dict(img=ori_img.copy()))
+                np.testing.assert_array_equal(results['img'], expect['img'])
+
+        # test the output is writable when keep channels
+        cfg['keep_channels'] = True
+        results = TRANSFORMS.build(cfg)(dict(img=ori_img.copy()))
+        self.assertEqual(results['img'].shape, (32, 48, 3))
+        self.assertTrue(results['img'].flags.writeable)
+        self.assertTrue(results['img'].flags.c_contiguous)
+
+        # test prob == 0, the uint8 image is not copied
+        cfg['prob'] = 0.
+        img = ori_img.copy()
+        results = TRANSFORMS.build(cfg)(dict(img=img))
+        self.assertIs(results['img'], img)
+        np.testing.assert_array_equal(results['img'], ori_img)
+        results = TRANSFORMS.build(cfg)(dict(img=ori_img.astype(np.float32)))
+        self.assertEqual(results['img'].dtype, np.uint8)
+
+        # test single channel image
+        cfg['prob'] = 1.
+        results = TRANSFORMS.build(cfg)(dict(img=ori_img[..., 0].copy()))
+        self.assertEqual(results['img'].shape, (32, 48, 1))
+
+
 class TestAlbumentations(TestCase):
     DEFAULT_ARGS = dict(
         type='Albumentations', transforms=[dict(type='ChannelShuffle', p=1)])
@@ -745,6 +895,19 @@ class TestAlbumentations(TestCase):
         albu_module = TRANSFORMS.build(cfg)
         ablu_result = albu_module(results)
 
+        # Test the keys out of keymap are kept
+        results = dict(img=copy.deepcopy(ori_img), gt_label=1)
+        cfg = copy.deepcopy(self.DEFAULT_ARGS)
+        albu_module = TRANSFORMS.build(cfg)
+        ablu_result = albu_module(results)
+        self.assertEqual(ablu_result['gt_label'], 1)
+        self.assertNotIn('image', ablu_result)
+
+        # Test the mapper with swapped keys
+        self.assertEqual(
+            albu_module.mapper(dict(a=1, b=2), dict(a='b', b='a')),
+            dict(a=2, b=1))
+
         # Test with nested transform
         results = dict(img=copy.deepcopy(ori_img))
         cfg = copy.deepcopy(self.DEFAULT_ARGS)
@@ -800,6 +963,54 @@ class TestAlbumentations(TestCase):
         assert np.equal(transformed_image_3rd,
                         transformed_image_mmpretrain).all()
 
+        # Test no transform can be applied
+        for transforms in [[], [dict(type='ChannelShuffle', p=0)]]:
+            cfg = copy.deepcopy(self.DEFAULT_ARGS)
+            cfg['transforms'] = transforms
+            albu_module = TRANSFORMS.build(cfg)
+            with patch.object(albu_module, 'aug') as mock_aug:
+                results = albu_module(dict(img=copy.deepcopy(ori_img)))
+            mock_aug.assert_not_called()
+            np.testing.assert_array_equal(results['img'], ori_img)
+            self.assertEqual(results['img_shape'], (256, 256))
+
+        # Test the transforms with always_apply are applied even if p=0
+        cfg = copy.deepcopy(self.DEFAULT_ARGS)
+        cfg['transforms'] = [
+            dict(type='ChannelShuffle', p=0, always_apply=True)
+        ]
+        albu_module = TRANSFORMS.build(cfg)
+        with patch.object(
+                albu_module, 'aug', return_value=dict(image=ori_img)) as mock:
+            albu_module(dict(img=copy.deepcopy(ori_img)))
+        mock.assert_called_once()
+
+        # Test warning once for non-uint8 images
+        cfg = copy.deepcopy(self.DEFAULT_ARGS)
+        albu_module = TRANSFORMS.build(cfg)
+        with patch('mmpretrain.datasets.transforms.processing.print_log'
+                   ) as mock_log:
+            albu_module(dict(img=ori_img.astype(np.float32)))
+            albu_module(dict(img=ori_img.astype(np.float32)))
+            albu_module(dict(img=copy.deepcopy(ori_img)))
+        mock_log.assert_called_once()
+
+        # Test crop_first
+        cfg = copy.deepcopy(self.DEFAULT_ARGS)
+        cfg['transforms'] = [
+            dict(type='Blur', blur_limit=3, p=1.0),
+            dict(type='HorizontalFlip', p=0.5),
+            dict(type=albumentations.CenterCrop, width=64, height=64),
+            dict(type='RandomCrop', width=32, height=32),
+        ]
+        cfg['crop_first'] = True
+        albu_module = TRANSFORMS.build(cfg)
+        self.assertEqual([t['type'] for t in albu_module.transforms], [
+            albumentations.CenterCrop, 'RandomCrop', 'Blur', 'HorizontalFlip'
+        ])
+        results = albu_module(dict(img=copy.deepcopy(ori_img)))
+        self.assertEqual(results['img_shape'], (32, 32))
+
         # Test class obj case
         results = dict(img=np.random.randint(0, 256, (200, 300, 3), np.uint8))
         cfg = copy.deepcopy(self.DEFAULT_ARGS)
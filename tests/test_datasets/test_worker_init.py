@@ -0,0 +1,51 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from mmpretrain.datasets import affinity_worker_init_fn
+
+
+class RandomDataset(Dataset):
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, idx):
+        affinity = sorted(os.sched_getaffinity(0)) if hasattr(
+            os, 'sched_getaffinity') else []
+        return np.random.randint(1 << 30), affinity
+
+
+class TestAffinityWorkerInitFn(TestCase):
+
+    def _load(self):
+        torch.manual_seed(0)
+        dataloader = DataLoader(
+            RandomDataset(),
+            batch_size=None,
+            num_workers=2,
+            worker_init_fn=affinity_worker_init_fn)
+        return list(dataloader)
+
+    def test_worker_init(self):
+        results = self._load()
+        values = [value for value, _ in results]
+        # The workers are seeded differently and reproducibly.
+        self.assertNotEqual(values[0], values[1])
+        self.assertEqual(values, [value for value, _ in self._load()])
+        for _, affinity in results:
+            self.assertGreater(len(affinity), 0)
+
+    def test_rank_seed(self):
+        # The same base seed on two ranks gives different worker seeds.
+        values = []
+        for rank in (0, 1):
+            with patch('mmpretrain.datasets.worker_init.get_rank',
+                       return_value=rank):
+                values.append([value for value, _ in self._load()])
+        self.assertTrue(set(values[0]).isdisjoint(values[1]))
@@ -0,0 +1,140 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import pytest
+import torch
+import torch.nn as nn
+from mmengine.hooks import Hook
+from mmengine.model import BaseModel
+from mmengine.runner import Runner
+from torch.utils.data import DataLoader, Dataset
+
+from mmpretrain.engine import CUDAPrefetcher, PrefetchEpochBasedTrainLoop
+
+
+class ExampleDataset(Dataset):
+
+    def __getitem__(self, idx):
+        return dict(
+            inputs=torch.tensor([float(idx)]),
+            meta=dict(idx=idx, feats=[torch.tensor([idx])]))
+
+    def __len__(self):
+        return 10
+
+
+class ExampleModel(BaseModel):
+
+    def __init__(self):
+        super().__init__()
+        self.linear = nn.Linear(1, 1)
+
+    def forward(self, inputs, data_samples=None, mode='tensor'):
+        return self.linear(inputs)
+
+    def train_step(self, data, optim_wrapper):
+        return dict(loss=torch.tensor(0.5))
+
+
+class CountIterHook(Hook):
+
+    def __init__(self):
+        self.before = []
+        self.after = []
+
+    def before_train_iter(self, runner, batch_idx, data_batch=None):
+        self.before.append(batch_idx)
+
+    def after_train_iter(self,
+                         runner,
+                         batch_idx,
+                         data_batch=None,
+                         outputs=None):
+        self.after.append(batch_idx)
+
+
+class TestCUDAPrefetcher(TestCase):
+
+    def setUp(self):
+        self.loader = DataLoader(ExampleDataset(), batch_size=4)
+
+    def test_len(self):
+        prefetcher = CUDAPrefetcher(self.loader)
+        self.assertEqual(len(prefetcher), len(self.loader))
+
+    def test_cpu_fallback(self):
+        prefetcher = CUDAPrefetcher(self.loader)
+        with patch('torch.cuda.is_available', return_value=False):
+            batches = list(prefetcher)
+        expects = list(self.loader)
+        self.assertEqual(len(batches), len(expects))
+        for batch, expect in zip(batches, expects):
+            self.assertEqual(batch['inputs'].device.type, 'cpu')
+            torch.testing.assert_close(batch['inputs'], expect['inputs'])
+            torch.testing.assert_close(batch['meta'], expect['meta'])
+
+    def test_apply(self):
+        data = dict(
+            a=torch.ones(2),
+            b=[torch.zeros(1), (torch.ones(1), 'str')],
+            c=dict(d=torch.ones(3)),
+            e=1)
+        outputs = CUDAPrefetcher._apply(data, lambda x: x + 1)
+        self.assertIsInstance(outputs['b'], list)
+        self.assertIsInstance(outputs['b'][1], tuple)
+        torch.testing.assert_close(outputs['a'], torch.full((2, ), 2.))
+        torch.testing.assert_close(outputs['b'][0], torch.ones(1))
+        torch.testing.assert_close(outputs['b'][1][0], torch.full((1, ), 2.))
+        self.assertEqual(outputs['b'][1][1], 'str')
+        torch.testing.assert_close(outputs['c']['d'], torch.full((3, ), 2.))
+        self.assertEqual(outputs['e'], 1)
+
+    @pytest.mark.skipif(
+        not torch.cuda.is_available(), reason='CUDA is not available.')
+    def test_cuda(self):
+        prefetcher = CUDAPrefetcher(self.loader)
+        batches = list(prefetcher)
+        self.assertEqual(len(batches), len(self.loader))
+        for batch, expect in zip(batches, self.loader):
+            self.assertEqual(batch['inputs'].device.type, 'cuda')
+            torch.testing.assert_close(batch['inputs'].cpu(),
+                                       expect['inputs'])
+            # the keys not in ``keys`` are left on CPU.
+            self.assertEqual(batch['meta']['feats'][0].device.type, 'cpu')
+
+
+class TestPrefetchEpochBasedTrainLoop(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_run(self):
+        hook = CountIterHook()
+        runner = Runner(
+            model=ExampleModel(),
+            work_dir=self.tmpdir.name,
+            train_dataloader=dict(
+                dataset=ExampleDataset(),
+                sampler=dict(type='DefaultSampler', shuffle=False),
+                batch_size=4,
+                num_workers=0),
+            train_cfg=dict(type='PrefetchEpochBasedTrainLoop', max_epochs=2),
+            optim_wrapper=dict(optimizer=dict(type='SGD', lr=0.1)),
+            custom_hooks=[hook],
+            default_hooks=dict(logger=None, checkpoint=None),
+            default_scope='mmpretrain',
+            log_level='WARNING',
+            experiment_name='test_prefetch_loop')
+        self.assertIsInstance(runner.train_loop, PrefetchEpochBasedTrainLoop)
+        runner.train()
+
+        # 10 samples with batch size 4 are 3 iterations per epoch.
+        self.assertEqual(runner.train_loop.iter, 6)
+        self.assertEqual(runner.train_loop.epoch, 2)
+        self.assertEqual(hook.before, [0, 1, 2, 0, 1, 2])
+        self.assertEqual(hook.after, [0, 1, 2, 0, 1, 2])
@@ -71,6 +71,15 @@ class TestImageClassifier(TestCase):
         model: ImageClassifier = MODELS.build(cfg)
         self.assertIsNone(model.data_preprocessor.batch_augments)
 
+        # test channels last memory format
+        cfg = {
+            **self.DEFAULT_ARGS, 'data_preprocessor':
+            dict(to_channels_last=True)
+        }
+        model: ImageClassifier = MODELS.build(cfg)
+        self.assertTrue(model.backbone.conv1.weight.is_contiguous(
+            memory_format=torch.channels_last))
+
     def test_extract_feat(self):
         inputs = torch.rand(1, 3, 224, 224)
         cfg = ConfigDict(self.DEFAULT_ARGS)
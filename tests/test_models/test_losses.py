@@ -184,6 +184,71 @@ def test_cross_entropy_loss():
         loss(cls_score, label, weight=weight), torch.tensor(208.))
 
 
+def test_crl_loss():
+    cls_score = torch.Tensor([[2, 0, 0], [0, 3, 0], [1, 0.5, 0], [0, 2, 1],
+                              [0, 1, 0]])
+    label = torch.tensor([0, 1, 1, 2, 0])
+    loss_cfg = dict(type='CRLLoss', min_classes=[1], k=2, margin=0.5)
+    loss = build_loss(loss_cfg)
+
+    # The samples 1 and 2 are the anchors and the hard positives, the samples
+    # 3 and 4 are the hard negatives of class 1.
+    loss_mjr = torch.nn.functional.cross_entropy(cls_score[[0, 3, 4]],
+                                                 label[[0, 3, 4]])
+    assert torch.allclose(
+        loss(cls_score, label), loss_mjr + torch.tensor(7. / 8))
+
+    # test top-k mining, only the sample 2 is the hard positive and the
+    # sample 3 is the hard negative
+    loss_cfg['k'] = 1
+    loss = build_loss(loss_cfg)
+    assert torch.allclose(
+        loss(cls_score, label), loss_mjr + torch.tensor(2. / 2))
+
+    # test without hard negatives, a virtual negative of score 1 is used
+    cls_score = torch.Tensor([[2, 0, 0], [0, 3, 0], [1, 0.5, 0]])
+    label = torch.tensor([0, 1, 1])
+    loss_mjr = torch.nn.functional.cross_entropy(cls_score[:1], label[:1])
+    assert torch.allclose(
+        loss(cls_score, label), loss_mjr + torch.tensor(1. / 2))
+
+    # test with sample-wise weight
+    weight = torch.tensor([0.5, 1., 1.])
+    assert torch.allclose(
+        loss(cls_score, label, weight=weight),
+        loss_mjr * 0.5 + torch.tensor(1. / 2))
+
+    # test without samples of the majority classes
+    assert torch.allclose(
+        loss(cls_score[1:], label[1:]), torch.tensor(1. / 2))
+
+    # test the lookup of the minority classes, the labels larger than all
+    # the minority classes are majority
+    loss = build_loss({**loss_cfg, 'min_classes': [3, 1]})
+    label = torch.tensor([0, 1, 2, 3, 4, 5])
+    assert loss._min_class_index(label).tolist() == [-1, 1, -1, 0, -1, -1]
+
+    # test class weight
+    loss = build_loss({**loss_cfg, 'class_weight': [1., 2., 3.]})
+    assert 'class_weight' not in loss.state_dict()
+    cls_score = torch.Tensor([[2, 0, 0], [0, 3, 0], [1, 0.5, 0], [0, 2, 1],
+                              [0, 1, 0]])
+    label = torch.tensor([0, 1, 1, 2, 0])
+    loss_mjr = torch.nn.functional.cross_entropy(
+        cls_score[[0, 3, 4]],
+        label[[0, 3, 4]],
+        weight=torch.tensor([1., 2., 3.]),
+        reduction='none').mean()
+    assert torch.allclose(
+        loss(cls_score, label), loss_mjr + torch.tensor(2. / 2))
+
+    # test the criterion of the majority classes
+    loss = build_loss({**loss_cfg, 'use_soft': True})
+    assert loss.cls_criterion.__name__ == 'soft_cross_entropy'
+    loss = build_loss({**loss_cfg, 'use_sigmoid': True})
+    assert loss.cls_criterion.__name__ == 'binary_cross_entropy'
+
+
 def test_focal_loss():
     # test focal_loss
     cls_score = torch.Tensor([[5, -5, 0], [5, -5, 0]])
@@ -77,6 +77,14 @@ class TestClsDataPreprocessor(TestCase):
         self.assertTrue((inputs >= -1).all())
         self.assertTrue((inputs <= 1).all())
 
+        # test the outputs are float32 for any input dtype
+        for dtype in (torch.uint8, torch.int64, torch.float16, torch.float64):
+            data = {'inputs': torch.randint(0, 256, (1, 3, 8, 8)).to(dtype)}
+            inputs = processor(data)['inputs']
+            self.assertEqual(inputs.dtype, torch.float32)
+            torch.testing.assert_close(
+                inputs, (data['inputs'].float() - 127.5) / 127.5)
+
     def test_batch_augmentation(self):
         cfg = dict(
             type='ClsDataPreprocessor',
@@ -103,6 +111,62 @@ class TestClsDataPreprocessor(TestCase):
         self.assertIn('inputs', processed_data)
         self.assertIsNone(processed_data['data_samples'])
 
+    def test_decode_jpeg(self):
+        import cv2
+        import numpy as np
+
+        img = np.random.randint(0, 256, (32, 48, 3), dtype=np.uint8)
+        img_bytes = cv2.imencode('.jpg', img)[1].reshape(-1)
+        cfg = dict(type='ClsDataPreprocessor', to_rgb=True, decode_jpeg=True)
+        processor: ClsDataPreprocessor = MODELS.build(cfg)
+
+        data = {'inputs': [torch.from_numpy(img_bytes)] * 2}
+        inputs = processor(data)['inputs']
+        self.assertEqual(inputs.shape, (2, 3, 32, 48))
+        # The decoded images are in RGB order and won't be flipped again.
+        target = torch.from_numpy(cv2.imdecode(img_bytes, cv2.IMREAD_COLOR))
+        target = target.flip(-1).permute(2, 0, 1).float()
+        self.assertLessEqual((inputs[0] - target).abs().mean().item(), 2.)
+
+    def test_resize(self):
+        cfg = dict(
+            type='ClsDataPreprocessor',
+            resize_scale=(64, 32),
+            resize_interpolation='bicubic')
+        processor: ClsDataPreprocessor = MODELS.build(cfg)
+
+        data = {
+            'inputs': [
+                torch.randint(0, 256, (3, 100, 120), dtype=torch.uint8),
+                torch.randint(0, 256, (3, 32, 64), dtype=torch.uint8)
+            ]
+        }
+        inputs = processor(data)['inputs']
+        self.assertEqual(inputs.shape, (2, 3, 32, 64))
+        torch.testing.assert_close(inputs[1], data['inputs'][1].float())
+
+        data = {'inputs': torch.randint(0, 256, (2, 3, 100, 120))}
+        inputs = processor(data)['inputs']
+        self.assertEqual(inputs.shape, (2, 3, 32, 64))
+
+        with self.assertRaisesRegex(AssertionError, 'pair of'):
+            MODELS.build(dict(type='ClsDataPreprocessor', resize_scale=64))
+
+    def test_to_channels_last(self):
+        cfg = dict(type='ClsDataPreprocessor', to_channels_last=True)
+        processor: ClsDataPreprocessor = MODELS.build(cfg)
+
+        data = {'inputs': [torch.randint(0, 256, (3, 32, 48))] * 2}
+        inputs = processor(data)['inputs']
+        self.assertEqual(inputs.shape, (2, 3, 32, 48))
+        self.assertTrue(
+            inputs.is_contiguous(memory_format=torch.channels_last))
+
+        data = {'inputs': torch.randint(0, 256, (2, 3, 32, 48))}
+        inputs = processor(data)['inputs']
+        self.assertTrue(
+            inputs.is_contiguous(memory_format=torch.channels_last))
+
 
 class TestSelfSupDataPreprocessor(TestCase):
 
@@ -18,6 +18,12 @@ class TestDataSample(TestCase):
         label = getattr(data_sample, key)
         self.assertIsInstance(label, torch.LongTensor)
 
+        # Test numpy integer scalar
+        method(np.int64(1))
+        label = getattr(data_sample, key)
+        self.assertIsInstance(label, torch.LongTensor)
+        self.assertTrue((label == torch.tensor([1])).all())
+
         # Test tensor with single number
         method(torch.tensor(2))
         self.assertIn(key, data_sample)
@@ -0,0 +1,99 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os.path as osp
+
+import numpy as np
+from mmengine import Config, DictAction, mkdir_or_exist, track_progress
+from numpy.lib.format import open_memmap
+
+from mmpretrain.datasets import build_dataset
+from mmpretrain.registry import TRANSFORMS
+
+# The transforms whose results don't change between epochs.
+DETERMINISTIC_TRANSFORMS = ('LoadImageFromFile', 'LoadJPEGFromFile', 'Resize',
+                            'TensorResize', 'ResizeEdge', 'CenterCrop',
+                            'EfficientNetCenterCrop')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Cache the pre-processed images of a dataset into a '
+        'memory-mapped file, which can be loaded by `LoadImageFromCache`.')
+    parser.add_argument('config', help='config file path')
+    parser.add_argument('out', help='output path of the cache (.npy) file')
+    parser.add_argument(
+        '--phase',
+        default='train',
+        type=str,
+        choices=['train', 'test', 'val'],
+        help='phase of dataset to cache, accept "train" "test" and "val".')
+    parser.add_argument(
+        '--cfg-options',
+        nargs='+',
+        action=DictAction,
+        help='override some settings in the used config, the key-value pair '
+        'in xxx=yyy format will be merged into config file. If the value to '
+        'be overwritten is a list, it should be like key="[a,b]" or key=a,b '
+        'It also allows nested list/tuple values, e.g. key="[(a,b),(c,d)]" '
+        'Note that the quotation marks are necessary and that no white space '
+        'is allowed.')
+    args = parser.parse_args()
+    return args
+
+
+def build_cache_pipeline(pipeline_cfg):
+    """Build the transforms before ``PackInputs`` and make sure all of them
+    are deterministic."""
+    from mmpretrain.datasets import get_transform_idx
+
+    pack_idx = get_transform_idx(pipeline_cfg, 'PackInputs')
+    if pack_idx >= 0:
+        pipeline_cfg = pipeline_cfg[:pack_idx]
+    for transform in pipeline_cfg:
+        if transform['type'] not in DETERMINISTIC_TRANSFORMS:
+            raise ValueError(
+                f'The result of `{transform["type"]}` may change between '
+                'epochs and cannot be cached. Only these transforms are '
+                f'supported before `PackInputs`: {DETERMINISTIC_TRANSFORMS}.')
+    return [TRANSFORMS.build(t) for t in pipeline_cfg]
+
+
+def main():
+    args = parse_args()
+    cfg = Config.fromfile(args.config)
+    if args.cfg_options is not None:
+        cfg.merge_from_dict(args.cfg_options)
+
+    dataset_cfg = cfg.get(f'{args.phase}_dataloader').dataset
+    pipeline = build_cache_pipeline(dataset_cfg.pipeline)
+    dataset_cfg.pipeline = []
+    dataset = build_dataset(dataset_cfg)
+
+    def process(idx):
+        results = dataset[idx]
+        for transform in pipeline:
+            results = transform(results)
+        img = results['img']
+        return img[..., None] if img.ndim == 2 else img
+
+    first = process(0)
+    h, w, c = first.shape
+    mkdir_or_exist(osp.dirname(osp.abspath(args.out)))
+    cache = open_memmap(
+        args.out, mode='w+', dtype=np.uint8, shape=(len(dataset), c, h, w))
+
+    def write(idx):
+        img = first if idx == 0 else process(idx)
+        assert img.shape == (h, w, c), \
+            f'All images should have the same shape {(h, w, c)} after ' \
+            f'the pipeline, but got {img.shape} of sample {idx}.'
+        cache[idx] = img.transpose(2, 0, 1)
+
+    track_progress(write, list(range(len(dataset))))
+    cache.flush()
+    print(f'\nCached {len(dataset)} images with shape {(c, h, w)} '
+          f'to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
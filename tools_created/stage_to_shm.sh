@@ -0,0 +1,32 @@
+#!/usr/bin/env bash
+# Copy a dataset to the /dev/shm RAM disk so that the dataloader workers don't
+# read from disk, then point the config to it, e.g.
+#
+#   source tools_created/stage_to_shm.sh ../../B_E_P_N_aug BEPN_AUG_ROOT
+#   source tools_created/stage_to_shm.sh ../../B_E_P_N BEPN_ROOT
+#
+# In docker the default /dev/shm is only 64MB, start the container with a
+# large enough `--shm-size` (e.g. `docker run --shm-size=16g ...`).
+
+SRC=${1:?usage: stage_to_shm.sh <dataset dir> [env var name]}
+VAR=${2:-BEPN_AUG_ROOT}
+SHM=${SHM_DIR:-/dev/shm}
+DST=${SHM}/$(basename "${SRC}")
+
+need=$(du -sk "${SRC}" | cut -f1)
+# the space already used by an earlier copy can be reused
+used=$(du -sk "${DST}" 2>/dev/null | cut -f1)
+have=$(( $(df -Pk "${SHM}" | awk 'NR==2 {print $4}') + ${used:-0} ))
+if [ "${need}" -ge "${have}" ]; then
+    echo "Not enough space in ${SHM}: need ${need}KB, have ${have}KB." \
+         "Increase the shm size (docker run --shm-size)." >&2
+    return 1 2>/dev/null || exit 1
+fi
+
+if command -v rsync >/dev/null; then
+    rsync -a --delete "${SRC%/}/" "${DST}/"
+else
+    rm -rf "${DST}" && cp -a "${SRC%/}" "${DST}"
+fi || { return 1 2>/dev/null || exit 1; }
+export "${VAR}=${DST}"
+echo "Staged ${SRC} to ${DST}, exported ${VAR}=${DST}"